@@ -0,0 +1,240 @@
+"""Registry, timer and per-commit result store for micro-benchmarks
+
+Cases are registered with ``@case`` and return the function to time.
+Cases can also record memory allocated per operation. Every run is
+saved as ``benchmarks/results/<commit>.json`` so timings
+can be compared against an earlier commit (``--compare``) or followed
+across all stored commits (``--history``).
+"""
+import argparse
+import fnmatch
+import gc
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import timeit
+import tracemalloc
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+
+# Median slowdown reported as a regression
+REGRESSION_RATIO = 1.2
+
+class Case(NamedTuple):
+    """Benchmark case
+
+    ``setup`` runs once and returns the zero-argument function to time.
+    ``inner`` is the number of operations one call of that function
+    performs, so results are reported per operation. With ``memory`` one
+    more call is traced for the bytes allocated at its peak and the bytes
+    still held while its result is alive.
+    """
+    name: str
+    setup: Callable[[], Callable[[], Any]]
+    inner: int = 1
+    memory: bool = False
+
+CASES: Dict[str, Case] = {}
+
+def case(name: str, params: Iterable = (None,), inner: int = 1, memory: bool = False):
+    """Register a benchmark; with ``params`` one case per value as ``name[value]``"""
+    def decorator(setup):
+        for param in params:
+            if param is None:
+                case_name, case_setup = name, setup
+            else:
+                case_name = f"{name}[{param}]"
+                case_setup = (lambda value: lambda: setup(value))(param)
+            if case_name in CASES:
+                raise ValueError(f"Benchmark already registered: {case_name}")
+            CASES[case_name] = Case(case_name, case_setup, inner, memory)
+        return setup
+    return decorator
+
+def measure(bench: Case, repeat: int = 5, min_time: float = 0.2) -> Dict[str, float]:
+    """Seconds per operation: median and min over ``repeat`` timed batches"""
+    func = bench.setup()
+    timer = timeit.Timer(func)
+    number = 1
+    while True:
+        elapsed = timer.timeit(number)
+        if elapsed >= min_time or number >= 1_000_000:
+            break
+        number *= 10 if elapsed < min_time / 10 else 2
+
+    samples = [elapsed] + timer.repeat(repeat=repeat - 1, number=number)
+    per_op = [sample / number / bench.inner for sample in samples]
+    result = {
+        'median': statistics.median(per_op),
+        'min': min(per_op),
+        'number': number
+    }
+    if bench.memory:
+        result.update(measure_memory(func, bench.inner))
+    return result
+
+def measure_memory(func: Callable[[], Any], inner: int = 1) -> Dict[str, float]:
+    """Bytes per operation allocated at the peak of one call and retained by its result"""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        start = tracemalloc.get_traced_memory()[0]
+        value = func()
+        peak = tracemalloc.get_traced_memory()[1]
+        gc.collect()
+        retained = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del value
+    return {
+        'peak_bytes': (peak - start) / inner,
+        'retained_bytes': (retained - start) / inner
+    }
+
+def _git(*args: str) -> str:
+    try:
+        return subprocess.run(
+            ['git', *args], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ''
+
+def current_commit() -> str:
+    """Short hash of HEAD, suffixed with ``+dirty`` for uncommitted changes"""
+    commit = _git('rev-parse', '--short=10', 'HEAD') or 'unknown'
+    if _git('status', '--porcelain', '--untracked-files=no'):
+        commit += '+dirty'
+    return commit
+
+def _result_path(commit: str) -> str:
+    return os.path.join(RESULTS_DIR, f"{commit}.json")
+
+def _read_results(commit: str) -> Optional[Dict[str, Dict[str, float]]]:
+    path = _result_path(commit)
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding='utf-8') as result_file:
+        return json.load(result_file)['results']
+
+def save_results(commit: str, results: Dict[str, Dict[str, float]]):
+    """Merge results into the commit's file, keeping cases not run this time"""
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    stored = _read_results(commit) or {}
+    stored.update(results)
+    document = {
+        'commit': commit,
+        'date': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'machine': platform.node(),
+        'results': stored
+    }
+    with open(_result_path(commit), 'w', encoding='utf-8') as result_file:
+        json.dump(document, result_file, indent=2, sort_keys=True)
+
+def load_results(commit: str) -> Optional[Dict[str, Dict[str, float]]]:
+    """Stored results for a commit-ish, falling back to its ``+dirty`` run"""
+    resolved = _git('rev-parse', '--short=10', commit) or commit
+    for name in (resolved, commit, f"{resolved}+dirty"):
+        results = _read_results(name)
+        if results is not None:
+            return results
+    return None
+
+def _format_time(seconds: float) -> str:
+    for unit, scale in (('s', 1), ('ms', 1e-3), ('us', 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f} {unit}"
+    return f"{seconds / 1e-9:.1f} ns"
+
+def _format_bytes(size: float) -> str:
+    for unit, scale in (('MB', 2 ** 20), ('KB', 2 ** 10)):
+        if abs(size) >= scale:
+            return f"{size / scale:.1f} {unit}"
+    return f"{size:.0f} B"
+
+def compare(base: Dict[str, Dict[str, float]], head: Dict[str, Dict[str, float]]) -> List[str]:
+    """Names of cases whose median got slower than REGRESSION_RATIO"""
+    regressions = []
+    print(f"\n{'case':<40}{'base':>12}{'head':>12}{'ratio':>8}")
+    for name, result in head.items():
+        if name not in base:
+            continue
+        ratio = result['median'] / base[name]['median']
+        flag = ''
+        if ratio > REGRESSION_RATIO:
+            flag = '  REGRESSION'
+            regressions.append(name)
+        print(
+            f"{name:<40}{_format_time(base[name]['median']):>12}"
+            f"{_format_time(result['median']):>12}{ratio:>8.2f}{flag}"
+        )
+    return regressions
+
+def history(pattern: str):
+    """Median of matching cases for every stored commit, oldest first"""
+    if not os.path.isdir(RESULTS_DIR):
+        print("No stored results")
+        return
+    documents = []
+    for file_name in os.listdir(RESULTS_DIR):
+        if file_name.endswith('.json'):
+            with open(os.path.join(RESULTS_DIR, file_name), encoding='utf-8') as result_file:
+                documents.append(json.load(result_file))
+    documents.sort(key=lambda document: document['date'])
+
+    names = sorted({
+        name for document in documents for name in document['results']
+        if fnmatch.fnmatch(name, pattern)
+    })
+    for name in names:
+        print(name)
+        for document in documents:
+            result = document['results'].get(name)
+            if result:
+                print(f"  {document['commit']:<18}{document['date']:<22}{_format_time(result['median']):>12}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run micro-benchmarks and store results per commit")
+    parser.add_argument('-k', dest='pattern', default='*', help="glob of case names to run")
+    parser.add_argument('--repeat', type=int, default=5, help="timed batches per case")
+    parser.add_argument('--compare', metavar='COMMIT', help="compare with results stored for a commit")
+    parser.add_argument('--history', action='store_true', help="show stored results instead of running")
+    parser.add_argument('--no-save', action='store_true', help="don't store results")
+    parser.add_argument('--list', action='store_true', help="list cases and exit")
+    args = parser.parse_args(argv)
+
+    selected = [bench for name, bench in CASES.items() if fnmatch.fnmatch(name, args.pattern)]
+    if args.list:
+        print('\n'.join(bench.name for bench in selected))
+        return
+    if args.history:
+        history(args.pattern)
+        return
+
+    commit = current_commit()
+    print(f"commit {commit}, python {platform.python_version()}")
+    results = {}
+    for bench in selected:
+        result = results[bench.name] = measure(bench, repeat=args.repeat)
+        line = f"{bench.name:<40}{_format_time(result['median']):>12}  (min {_format_time(result['min'])})"
+        if bench.memory:
+            line += (
+                f"  peak {_format_bytes(result['peak_bytes'])},"
+                f" retained {_format_bytes(result['retained_bytes'])}"
+            )
+        print(line)
+
+    if not args.no_save:
+        save_results(commit, results)
+
+    if args.compare:
+        base = load_results(args.compare)
+        if base is None:
+            sys.exit(f"No stored results for {args.compare}")
+        if compare(base, results):
+            sys.exit(1)
@@ -0,0 +1,121 @@
+"""Per-handler latency with simulated network round trips
+
+Backend and Telegram calls are replaced with fakes that sleep for a
+fixed latency, so the measured time is dominated by how many round
+trips each handler waits for one after another. Every handler runs as
+``legacy`` (the await order it had before independent calls were
+gathered), ``gathered`` and ``task_in_response`` (the backend returns
+the updated task with the mutation). Results are stored per commit, see
+``benchmarks.harness``.
+
+Run from the bot directory::
+
+    python -m benchmarks.latency
+    python -m benchmarks.latency -k 'handler.approve_task*' --compare HEAD~1
+"""
+import asyncio
+from types import SimpleNamespace
+import handlers.task as task_handlers
+from benchmarks.harness import case, main
+from models.api import Task
+from utils.api import APIResponse, parse_response
+from utils.callbacks import Action, CallbackPayload
+
+API_LATENCY = 0.05
+TELEGRAM_LATENCY = 0.03
+
+LOOP = asyncio.new_event_loop()
+
+TASK = {
+    'id': 1,
+    'title': "Hisobot",
+    'description': "Oylik hisobot",
+    'status': 'in_progress',
+    'deadline': '2024-03-01T00:00:00',
+    'files': [{'file_url': 'https://example.com/a.pdf', 'name': 'a.pdf', 'file_type': 'pdf'}]
+}
+
+async def telegram_call(*args, **kwargs):
+    await asyncio.sleep(TELEGRAM_LATENCY)
+
+async def get_task_detail(task_id):
+    await asyncio.sleep(API_LATENCY)
+    return parse_response(APIResponse({'status': 'success', 'task': TASK}, 200), 'task', Task)
+
+def mutation(include_task: bool):
+    async def request(*args, **kwargs):
+        await asyncio.sleep(API_LATENCY)
+        response = {'status': 'success'}
+        if include_task:
+            response['task'] = TASK
+        return parse_response(APIResponse(response, 200), 'task', Task)
+    return request
+
+def make_message():
+    return SimpleNamespace(
+        text=None,
+        document=SimpleNamespace(file_id="f1", file_name="a.pdf"),
+        photo=None,
+        from_user=SimpleNamespace(id=1),
+        answer=telegram_call,
+        edit_text=telegram_call
+    )
+
+def make_callback():
+    return SimpleNamespace(
+        from_user=SimpleNamespace(id=1),
+        message=make_message(),
+        answer=telegram_call
+    )
+
+class FakeState:
+    async def get_data(self):
+        return {'task_id': 1}
+
+    async def clear(self):
+        pass
+
+async def legacy_task_view():
+    await get_task_detail(1)
+    await telegram_call()  # edit_text
+    await telegram_call()  # file list
+
+async def legacy_task_files():
+    await mutation(False)()
+    await telegram_call()  # success message
+    await get_task_detail(1)
+    await telegram_call()  # task card
+
+async def legacy_approve():
+    await mutation(False)()
+    await get_task_detail(1)
+    await telegram_call()  # edit_text
+
+LEGACY = {
+    'process_task_view': legacy_task_view,
+    'process_task_files': legacy_task_files,
+    'approve_task': legacy_approve,
+}
+
+def current_flow(name: str, include_task: bool):
+    task_handlers.get_task_detail = get_task_detail
+    task_handlers.update_task_status = mutation(include_task)
+    task_handlers.submit_task_progress = mutation(include_task)
+    payload = CallbackPayload(Action.TASK_VIEW, 1)
+    return {
+        'process_task_view': lambda: task_handlers.process_task_view(make_callback(), FakeState(), payload),
+        'process_task_files': lambda: task_handlers.process_task_files(make_message(), FakeState()),
+        'approve_task': lambda: task_handlers.approve_task(make_callback(), FakeState(), payload),
+    }[name]
+
+for _handler in LEGACY:
+    @case(f'handler.{_handler}', params=('legacy', 'gathered', 'task_in_response'))
+    def bench_handler(flow: str, name=_handler):
+        if flow == 'legacy':
+            run = LEGACY[name]
+        else:
+            run = current_flow(name, include_task=flow == 'task_in_response')
+        return lambda: LOOP.run_until_complete(run())
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,279 @@
+"""Micro-benchmarks for code that runs on every update
+
+Covers callback routing, cache keys and the ``cached`` wrapper, task
+message and keyboard rendering, allocations of the shared keyboards,
+input validation, JSON codecs on task-list payloads, memory held by
+cached task lists and the users Excel export. Results are
+stored per commit, see ``benchmarks.harness``.
+
+Run from the bot directory::
+
+    python -m benchmarks.micro                 # run all, store results
+    python -m benchmarks.micro -k 'cached*'    # run a subset
+    python -m benchmarks.micro --compare HEAD~1
+    python -m benchmarks.micro --history -k 'format*'
+"""
+import asyncio
+import itertools
+import os
+import tempfile
+import time
+from aiogram import F, Router
+from aiogram.types import CallbackQuery, KeyboardButton, ReplyKeyboardMarkup, User
+from sqlalchemy import create_engine, text
+from benchmarks.harness import case, main
+from handlers.task import format_task_message
+from keyboards.inline import get_task_detail_keyboard, get_tasks_keyboard
+from keyboards.reply import get_cancel_kb, get_main_menu
+from loadtest.fake_backend import make_task
+from models.api import Task
+from utils.api import APIClient, APIResponse, cache, cache_key, cached, parse_response
+from utils.callbacks import Action, CallbackTable, pack
+from utils.codec import CODECS, get_codec
+
+LOOP = asyncio.new_event_loop()
+RESPONSE = APIResponse({'status': 'success', 'task': make_task(1)}, 200)
+
+# Calls per timed batch for the async cache and routing cases
+CACHE_BATCH = 1000
+ROUTING_BATCH = 1000
+
+def _fetcher():
+    @cached(ttl=60)
+    async def fetch(task_id: int) -> APIResponse:
+        return RESPONSE
+    return fetch
+
+ROUTED_ACTIONS = (
+    Action.TASK_VIEW, Action.TASK_STATS, Action.TASK_COMPLETE,
+    Action.TASK_REJECT, Action.TASK_APPROVE, Action.TASKS_LIST
+)
+
+def _callbacks(data) -> list:
+    return [
+        CallbackQuery(
+            id="1",
+            from_user=User(id=1, is_bot=False, first_name="Bench"),
+            chat_instance="bench",
+            data=item
+        )
+        for item in data
+    ]
+
+def _route(router: Router, callbacks: list):
+    async def batch():
+        for i in range(ROUTING_BATCH):
+            await router.propagate_event("callback_query", callbacks[i % len(callbacks)])
+    return lambda: LOOP.run_until_complete(batch())
+
+@case('route.legacy_filters', inner=ROUTING_BATCH)
+def bench_route_legacy_filters():
+    """User, task and admin routers walking ``F.data.startswith`` filters, as before the table"""
+    async def handler(callback: CallbackQuery):
+        return int(callback.data.split('_')[2]) if callback.data != "tasks_list" else None
+
+    root, user, task, admin = Router(), Router(), Router(), Router()
+    user.callback_query(F.data.startswith("task_view_"))(handler)
+    user.callback_query(F.data == "tasks_list")(handler)
+    for prefix in ("task_view_", "task_stats_", "task_complete_", "task_reject_", "task_approve_"):
+        task.callback_query(F.data.startswith(prefix))(handler)
+    admin.callback_query(F.data.startswith("task_"))(handler)
+    for router in (user, task, admin):
+        root.include_router(router)
+
+    return _route(root, _callbacks([
+        "task_view_1024", "task_stats_1024", "task_complete_1024",
+        "task_reject_1024", "task_approve_1024", "tasks_list"
+    ]))
+
+@case('route.callback_table', inner=ROUTING_BATCH)
+def bench_route_callback_table():
+    router, table = Router(), CallbackTable()
+
+    async def handler(callback, payload):
+        return payload.task_id
+
+    for action in ROUTED_ACTIONS:
+        table.register(action)(handler)
+
+    @router.callback_query(table)
+    async def dispatch_callback(callback: CallbackQuery, callback_handler, callback_payload):
+        return await callback_handler(callback, callback_payload)
+
+    return _route(router, _callbacks([pack(action, 1024) for action in ROUTED_ACTIONS]))
+
+@case('cache_key')
+def bench_cache_key():
+    return lambda: cache_key('get_task_detail', 42)
+
+@case('cached.hit', inner=CACHE_BATCH)
+def bench_cached_hit():
+    cache.clear()
+    fetch = _fetcher()
+    LOOP.run_until_complete(fetch(1))
+
+    async def hits():
+        for _ in range(CACHE_BATCH):
+            await fetch(1)
+    return lambda: LOOP.run_until_complete(hits())
+
+@case('cached.miss', params=(10, 1000, 10000), inner=CACHE_BATCH)
+def bench_cached_miss(entries: int):
+    """Miss followed by the expiry sweep over ``entries`` live entries"""
+    cache.clear()
+    expires_at = time.monotonic() + 60
+    for i in range(entries):
+        cache[('filler', (i,))] = (expires_at, RESPONSE)
+    fetch = _fetcher()
+
+    async def misses():
+        for task_id in range(CACHE_BATCH):
+            await fetch(task_id)
+            fetch.invalidate(task_id)
+    return lambda: LOOP.run_until_complete(misses())
+
+@case('format_task_message')
+def bench_format_task_message():
+    data = make_task(4)
+    data['rejection_reason'] = "Hisobot to'liq emas"
+    task = Task.from_dict(data)
+    return lambda: format_task_message(task)
+
+@case('get_tasks_keyboard', params=(10, 100, 1000))
+def bench_get_tasks_keyboard(count: int):
+    tasks = [Task.from_dict(make_task(task_id)) for task_id in range(1, count + 1)]
+    return lambda: get_tasks_keyboard(tasks)
+
+KEYBOARD_TASK_IDS = range(1, 201)
+KEYBOARD_STATUSES = ('pending', 'in_progress', 'completed')
+
+def _keyboard_updates(update):
+    """One simulated update per call, cycling through tasks and statuses"""
+    updates = itertools.count()
+    for i in range(len(KEYBOARD_TASK_IDS) * len(KEYBOARD_STATUSES)):
+        update(next(updates))
+    return lambda: update(next(updates))
+
+@case('keyboards.rebuilt', memory=True)
+def bench_keyboards_rebuilt():
+    """Reply and task detail keyboards built per update, as before they were shared"""
+    def update(i: int):
+        ReplyKeyboardMarkup(keyboard=[
+            [KeyboardButton(text="📋 Mening topshiriqlarim")],
+            [KeyboardButton(text="📊 Statistika"), KeyboardButton(text="⚙️ Sozlamalar")],
+            [KeyboardButton(text="📞 Yordam")]
+        ], resize_keyboard=True)
+        ReplyKeyboardMarkup(keyboard=[[KeyboardButton(text="❌ Bekor qilish")]], resize_keyboard=True)
+        get_task_detail_keyboard.__wrapped__(
+            KEYBOARD_TASK_IDS[i % len(KEYBOARD_TASK_IDS)], KEYBOARD_STATUSES[i % 3]
+        )
+    return _keyboard_updates(update)
+
+@case('keyboards.shared', memory=True)
+def bench_keyboards_shared():
+    def update(i: int):
+        get_main_menu()
+        get_cancel_kb()
+        get_task_detail_keyboard(KEYBOARD_TASK_IDS[i % len(KEYBOARD_TASK_IDS)], KEYBOARD_STATUSES[i % 3])
+    return _keyboard_updates(update)
+
+@case('clean_phone_number')
+def bench_clean_phone_number():
+    return lambda: APIClient.clean_phone_number("+998 90 123-45-67")
+
+@case('validate_jshir')
+def bench_validate_jshir():
+    return lambda: APIClient.validate_jshir(" 12345678901234 ")
+
+def _task_list_payload(count: int) -> dict:
+    """Task list response as the backend sends it, with long descriptions and files"""
+    tasks = []
+    for task_id in range(1, count + 1):
+        task = make_task(task_id)
+        task['description'] = "Mahalladagi xonadonlar bo'yicha ma'lumotlarni yig'ish va tahlil qilish. " * 5
+        task['files'] = task['files'] * 3
+        tasks.append(task)
+    return {'status': 'success', 'tasks': tasks}
+
+for _codec in CODECS.values():
+    @case(f'codec.decode.{_codec.name}', params=(20, 200))
+    def bench_codec_decode(count: int, codec=_codec):
+        body = codec.dumps(_task_list_payload(count))
+        return lambda: codec.loads(body)
+
+    @case(f'codec.encode.{_codec.name}', params=(20, 200))
+    def bench_codec_encode(count: int, codec=_codec):
+        payload = _task_list_payload(count)
+        return lambda: codec.dumps(payload)
+
+# Tasks in the response measured for memory held per cached task
+MODEL_TASKS = 1000
+
+def _task_list_body() -> bytes:
+    tasks = []
+    for task_id in range(1, MODEL_TASKS + 1):
+        task = make_task(task_id)
+        task['rejection_reason'] = None
+        task['is_admin'] = False
+        tasks.append(task)
+    return get_codec().dumps({'status': 'success', 'tasks': tasks})
+
+@case('task_list.dicts', inner=MODEL_TASKS, memory=True)
+def bench_task_list_dicts():
+    """Decoded response kept as nested dicts, as cached before the models"""
+    body, codec = _task_list_body(), get_codec()
+    return lambda: APIResponse(codec.loads(body), 200)
+
+@case('task_list.models', inner=MODEL_TASKS, memory=True)
+def bench_task_list_models():
+    body, codec = _task_list_body(), get_codec()
+    return lambda: parse_response(APIResponse(codec.loads(body), 200), 'tasks', Task)
+
+def _users_database(rows: int) -> str:
+    """SQLite file with the tables read by the users export"""
+    path = os.path.join(tempfile.mkdtemp(prefix='bench-excel-'), 'users.db')
+    engine = create_engine(f"sqlite:///{path}")
+    with engine.begin() as connection:
+        connection.execute(text("CREATE TABLE api_mahalla (id INTEGER PRIMARY KEY, name TEXT)"))
+        connection.execute(text("CREATE TABLE api_jobtitle (id INTEGER PRIMARY KEY, name TEXT)"))
+        connection.execute(text(
+            "CREATE TABLE api_user (telegram_id INTEGER, username TEXT, phone_number TEXT, "
+            "full_name TEXT, jshir TEXT, job_title_id INTEGER, mahalla_id INTEGER, created_at TEXT)"
+        ))
+        connection.execute(
+            text("INSERT INTO api_mahalla VALUES (:id, :name)"),
+            [{'id': i, 'name': f"Mahalla {i}"} for i in range(1, 51)]
+        )
+        connection.execute(
+            text("INSERT INTO api_jobtitle VALUES (:id, :name)"),
+            [{'id': i, 'name': f"Lavozim {i}"} for i in range(1, 11)]
+        )
+        connection.execute(
+            text(
+                "INSERT INTO api_user VALUES (:telegram_id, :username, :phone, :full_name, "
+                ":jshir, :job_title_id, :mahalla_id, :created_at)"
+            ),
+            [{
+                'telegram_id': 7_000_000_000 + i,
+                'username': f"user{i}",
+                'phone': f"99890{i:07d}",
+                'full_name': f"Foydalanuvchi {i}",
+                'jshir': f"{i:014d}",
+                'job_title_id': i % 10 + 1,
+                'mahalla_id': i % 50 + 1,
+                'created_at': f"2024-01-{i % 28 + 1:02d} 10:00:00"
+            } for i in range(rows)]
+        )
+    engine.dispose()
+    return path
+
+@case('generate_users_excel', params=(100, 1000))
+def bench_generate_users_excel(rows: int):
+    # pandas is only imported when this case is selected
+    from services import excel
+
+    excel.settings = excel.settings._replace(database_url=f"sqlite:///{_users_database(rows)}")
+    return excel.generate_users_excel
+
+if __name__ == "__main__":
+    main()
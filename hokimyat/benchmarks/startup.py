@@ -0,0 +1,40 @@
+"""Cold-start benchmarks for the bot entry point
+
+Every case starts a fresh interpreter, so the timings include all imports
+made before the first update can be handled. Results are stored per
+commit, see ``benchmarks.harness``.
+
+Run from the bot directory::
+
+    python -m benchmarks.startup
+    python -m benchmarks.startup --compare HEAD~1
+    python bot.py --profile-startup    # where the time goes
+"""
+import os
+import subprocess
+import sys
+from benchmarks.harness import case, main
+from utils.startup import BOT_DIR, STARTUP_CODE
+
+STAGES = {
+    'interpreter': "pass",
+    'import_bot': "import bot",
+    'create_dispatcher': STARTUP_CODE,
+    # Rarely used admin features must not weigh on startup
+    'import_admin': "import handlers.admin",
+}
+
+# Development profile: a sqlite engine, so the timings cover imports and not
+# the deployment's database driver, and no deployment settings are required
+ENVIRONMENT = {**os.environ, 'BOT_ENV': 'development', 'DATABASE_URL': 'sqlite:///bot.db'}
+
+def _start(code: str):
+    subprocess.run([sys.executable, '-c', code], cwd=BOT_DIR, env=ENVIRONMENT, check=True)
+
+for _stage, _code in STAGES.items():
+    @case(f'startup.{_stage}')
+    def bench_startup(code=_code):
+        return lambda: _start(code)
+
+if __name__ == "__main__":
+    main()
@@ -1,35 +1,119 @@
+import argparse
 import asyncio
-import logging
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
 from aiogram import Bot, Dispatcher
+from aiogram.fsm.storage.base import BaseStorage
 from aiogram.fsm.storage.memory import MemoryStorage
-from config import BOT_TOKEN
-from handlers import user, task
+from config import settings
+from handlers import load_routers
+from middlewares.lifecycle import InFlightMiddleware
+from middlewares.log_context import LogContextMiddleware
+from middlewares.metrics import HandlerMetricsMiddleware, TelegramMetricsMiddleware
+from middlewares.tracing import HandlerSpanMiddleware, TracingMiddleware, TracingRequestMiddleware
+from utils.api import APIClient, api_client
+from utils.lifecycle import lifecycle
+from utils.metrics import start_metrics_server
 from utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
-async def main():
-    # Configure logging
-    logging.basicConfig(level=logging.INFO)
+async def on_startup(bot: Bot):
+    """Open the backend, Telegram and database pools before the first update"""
+    await asyncio.gather(api_client.warm_up(), bot.me(), lifecycle.warm())
+    logger.info("Pools warmed")
+
+async def on_shutdown(bot: Bot):
+    """Drain in-flight updates, then close pools from the outside in
+
+    Polling has already stopped when the dispatcher emits shutdown, so no
+    new updates arrive. Updates still running get ``shutdown_timeout``
+    seconds; broadcasts stop at their next checkpoint.
+    """
+    await lifecycle.drain(settings.shutdown_timeout)
+    await APIClient.close()
+    await bot.session.close()
+    await lifecycle.close()
+    logger.info("Shutdown complete")
+
+def create_dispatcher(storage: Optional[BaseStorage] = None) -> Dispatcher:
+    """Dispatcher with middlewares and routers, shared by the bot and the load tests"""
+    dp = Dispatcher(storage=storage or MemoryStorage())
+    
+    # In-flight tracking, so shutdown can drain running handlers
+    dp.update.outer_middleware(InFlightMiddleware())
+    
+    # Per-update logging context
+    dp.message.middleware(LogContextMiddleware())
+    dp.callback_query.middleware(LogContextMiddleware())
+    
+    # Handler latency metrics
+    dp.message.middleware(HandlerMetricsMiddleware())
+    dp.callback_query.middleware(HandlerMetricsMiddleware())
+    
+    # Per-update traces with spans for handlers
+    if settings.tracing_enabled:
+        dp.update.outer_middleware(TracingMiddleware())
+        dp.message.middleware(HandlerSpanMiddleware())
+        dp.callback_query.middleware(HandlerSpanMiddleware())
     
+    # Register routers, importing only the enabled handler modules
+    dp.include_routers(*load_routers(settings.handlers))
+    
+    dp.startup.register(on_startup)
+    dp.shutdown.register(on_shutdown)
+    return dp
+
+def instrument_bot(bot: Bot) -> Bot:
+    """Attach metrics and tracing to outgoing Telegram calls"""
+    bot.session.middleware(TelegramMetricsMiddleware())
+    if settings.tracing_enabled:
+        bot.session.middleware(TracingRequestMiddleware())
+    return bot
+
+async def main():
+    # Blocking work (trace export, file writes) runs on this pool
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=settings.executor_workers)
+    )
+
     # Initialize bot and dispatcher
-    bot = Bot(token=BOT_TOKEN)
-    storage = MemoryStorage()
-    dp = Dispatcher(storage=storage)
+    bot = instrument_bot(Bot(token=settings.bot_token))
+    dp = create_dispatcher()
     
-    # Register routers
-    dp.include_router(user.router)
-    dp.include_router(task.router)
+    metrics_runner = None
+    if settings.metrics_enabled:
+        metrics_runner = await start_metrics_server(settings.metrics_host, settings.metrics_port)
     
     # Start polling
-    logger.info("Starting bot...")
-    await bot.delete_webhook(drop_pending_updates=True)
-    await dp.start_polling(bot)
+    logger.info("Starting bot with the %s profile...", settings.bot_env)
+    try:
+        await bot.delete_webhook(drop_pending_updates=True)
+        await dp.start_polling(bot)
+    finally:
+        if metrics_runner:
+            await metrics_runner.cleanup()
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run the bot")
+    parser.add_argument(
+        '--profile-startup', action='store_true',
+        help="report import time per module in a fresh interpreter and exit"
+    )
+    parser.add_argument('--top', type=int, default=25, help="modules listed by --profile-startup")
+    return parser.parse_args(argv)
 
 if __name__ == "__main__":
+    args = parse_args()
+    if args.profile_startup:
+        from utils.startup import format_report, profile_startup
+
+        print(format_report(*profile_startup(), top=args.top))
+        sys.exit(0)
     try:
         asyncio.run(main())
     except (KeyboardInterrupt, SystemExit):
         logger.info("Bot stopped!")
     except Exception as e:
-        logger.error(f"Unexpected error: {e}")
\ No newline at end of file
+        logger.error("Unexpected error: %s", e)
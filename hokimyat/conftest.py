@@ -0,0 +1,5 @@
+import os
+
+# Settings load on first import of config; tests run against the development
+# profile instead of requiring the deployment's DATABASE_URL, API_URL and ADMIN_IDS
+os.environ.setdefault('BOT_ENV', 'development')
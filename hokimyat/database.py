@@ -1,12 +1,39 @@
 
-from sqlalchemy import create_engine
+import asyncio
+from sqlalchemy import create_engine, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
-from config import DATABASE_URL
+from config import settings
+from utils.lifecycle import lifecycle
+from utils.tracing import instrument_engine
 
-engine = create_engine(DATABASE_URL)
+def engine_options(url: str) -> dict:
+    # SQLite engines pick their own pool, which takes no size arguments
+    if url.startswith('sqlite'):
+        return {}
+    return {
+        'pool_size': settings.db_pool_size,
+        'max_overflow': settings.db_max_overflow,
+        'pool_timeout': settings.db_pool_timeout,
+        'pool_recycle': settings.db_pool_recycle,
+        'pool_pre_ping': True
+    }
+
+engine = create_engine(settings.database_url, **engine_options(settings.database_url))
+instrument_engine(engine)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+def warm_pool():
+    """Open a pooled connection so the first query skips the handshake"""
+    with engine.connect() as connection:
+        connection.execute(text('SELECT 1'))
+
+lifecycle.add_resource(
+    'database',
+    warm=lambda: asyncio.to_thread(warm_pool),
+    close=lambda: asyncio.to_thread(engine.dispose)
+)
+
 Base = declarative_base()
 
 def get_db():
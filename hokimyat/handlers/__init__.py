@@ -0,0 +1,28 @@
+"""Handler registry
+
+Routers are listed by name and imported only when a dispatcher is built,
+so importing the package is cheap and a deployment loads just the routers
+enabled in ``HANDLERS``.
+"""
+import importlib
+from typing import Iterable, List
+from aiogram import Router
+
+ROUTERS = {
+    'user': 'handlers.user',
+    'task': 'handlers.task',
+    'admin': 'handlers.admin',
+}
+
+def load_routers(names: Iterable[str]) -> List[Router]:
+    """Import the named handler modules and return their routers in order"""
+    routers = []
+    for name in names:
+        try:
+            module = ROUTERS[name]
+        except KeyError:
+            raise ValueError(
+                f"Unknown handler module: {name!r}, expected one of {', '.join(ROUTERS)}"
+            ) from None
+        routers.append(importlib.import_module(module).router)
+    return routers
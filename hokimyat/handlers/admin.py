@@ -6,18 +6,16 @@ from aiogram.fsm.state import State, StatesGroup
 from database import SessionLocal
 from models.base import User, Channel
 from keyboards import inline
+from config import settings
 from services.broadcaster import broadcast_message
 from services.excel import generate_users_excel
 from utils.logger import setup_logger
-from keyboards.inline import get_task_management_kb, get_task_status_kb
-from utils.api import get_user_tasks, submit_task_progress
-from config import ADMIN_IDS
 
 
 logger = setup_logger(__name__)
-router = Router()
+router = Router(name="admin")
 
-MAIN_ADMIN_IDS = [6236467772, 5645086563]
+MAIN_ADMIN_IDS = settings.admin_ids
 
 class AdminStates(StatesGroup):
     waiting_broadcast = State()
@@ -132,9 +130,9 @@ async def confirm_new_admin(callback: CallbackQuery):
                     "Admin paneliga kirish uchun /admin buyrug'ini yuboring."
                 )
             except Exception as e:
-                logger.error(f"Failed to notify new admin: {e}")
+                logger.error("Failed to notify new admin: %s", e)
     except Exception as e:
-        logger.error(f"Failed to add admin: {e}")
+        logger.error("Failed to add admin: %s", e)
         await callback.message.edit_text("❌ Xatolik yuz berdi!")
     finally:
         db.close()
@@ -159,12 +157,15 @@ async def process_broadcast(message: Message, state: FSMContext, bot: Bot):
     if not await is_admin(message.from_user.id):
         return
     
-    successful, failed = await broadcast_message(bot, message.text)
-    await message.reply(
+    result = await broadcast_message(bot, message.text)
+    text = (
         f"Xabar yuborildi:\n"
-        f"✅ Muvaffaqiyatli: {successful}\n"
-        f"❌ Muvaffaqiyatsiz: {failed}"
+        f"✅ Muvaffaqiyatli: {result.successful}\n"
+        f"❌ Muvaffaqiyatsiz: {result.failed}"
     )
+    if result.interrupted:
+        text += f"\n⏸ Bot to'xtatilgani sababli yuborish {result.checkpoint} ID dan keyin to'xtadi"
+    await message.reply(text)
     await state.clear()
 
 @router.callback_query(F.data == "admin_export")
@@ -179,9 +180,9 @@ async def export_users(callback: CallbackQuery, bot: Bot):
             document=("users.xlsx", buffer),
             caption="Foydalanuvchilar ro'yxati"
         )
-        logger.info(f"Excel fayl adminga yuborildi {callback.from_user.id}")
+        logger.info("Excel fayl adminga yuborildi %s", callback.from_user.id)
     except Exception as e:
-        logger.error(f"Excel faylni yuborishda xatolik: {e}")
+        logger.error("Excel faylni yuborishda xatolik: %s", e)
         await callback.message.answer("Excel faylni yaratishda xatolik yuz berdi")
 
 @router.callback_query(F.data == "admin_channel")
@@ -207,89 +208,20 @@ async def process_channel(message: Message, state: FSMContext, bot: Bot):
             )
             db.add(channel)
             db.commit()
-            logger.info(f"Yangi kanal qo'shildi: {message.text}")
+            logger.info("Yangi kanal qo'shildi: %s", message.text)
             await message.reply("Kanal muvaffaqiyatli qo'shildi!")
         except Exception as e:
-            logger.error(f"Kanalni qo'shishda xatolik {message.text}: {e}")
+            logger.error("Kanalni qo'shishda xatolik %s: %s", message.text, e)
             db.rollback()
             await message.reply("Kanalni qo'shishda xatolik yuz berdi")
         finally:
             db.close()
     except Exception as e:
-        logger.error(f"Kanal ma'lumotlarini olishda xatolik {message.text}: {e}")
+        logger.error("Kanal ma'lumotlarini olishda xatolik %s: %s", message.text, e)
         await message.reply("Noto'g'ri kanal usernamesi")
     finally:
         await state.clear()
 
-@router.message(Command("tasks"))
-async def cmd_tasks(message: Message):
-    """Handle /tasks command for admins"""
-    if message.from_user.id not in ADMIN_IDS:
-        await message.answer("Bu buyruq faqat adminlar uchun.")
-        return
-
-    try:
-        tasks, status = await get_user_tasks()
-        if status == 200 and tasks.get('status') == 'success':
-            task_list = tasks.get('tasks', [])
-            if task_list:
-                await message.answer(
-                    "Mavjud topshiriqlar:",
-                    reply_markup=get_task_management_kb(task_list)
-                )
-            else:
-                await message.answer("Hozircha topshiriqlar yo'q.")
-        else:
-            await message.answer("Topshiriqlarni olishda xatolik yuz berdi.")
-    except Exception as e:
-        logger.error(f"Error in tasks command: {e}")
-        await message.answer("Xatolik yuz berdi. Iltimos, qaytadan urinib ko'ring.")
-
-
-@router.callback_query(F.data.startswith("task_"))
-async def process_task_callback(callback: CallbackQuery):
-    """Handle task management callbacks"""
-    if callback.from_user.id not in ADMIN_IDS:
-        await callback.answer("Bu amal faqat adminlar uchun.", show_alert=True)
-        return
-
-    try:
-        action, task_id = callback.data.split("_")[1:]
-        
-        if action == "status":
-            await callback.message.edit_reply_markup(
-                reply_markup=get_task_status_kb(task_id)
-            )
-        elif action == "mark":
-            status = task_id.split("-")[1]  # task_mark_123-completed
-            task_id = task_id.split("-")[0]
-            
-            result, status_code = await submit_task_progress(task_id, status)
-            
-            if status_code == 200:
-                await callback.answer(
-                    "Topshiriq statusi muvaffaqiyatli o'zgartirildi!",
-                    show_alert=True
-                )
-                # Update task list
-                tasks, _ = await get_user_tasks()
-                if tasks.get('status') == 'success':
-                    await callback.message.edit_reply_markup(
-                        reply_markup=get_task_management_kb(tasks.get('tasks', []))
-                    )
-            else:
-                await callback.answer(
-                    "Xatolik yuz berdi. Qaytadan urinib ko'ring.",
-                    show_alert=True
-                )
-    except Exception as e:
-        logger.error(f"Error in task callback: {e}")
-        await callback.answer(
-            "Xatolik yuz berdi. Qaytadan urinib ko'ring.",
-            show_alert=True
-        )
-
-
 def register_handlers(dp: Dispatcher):
     dp.include_router(router)
 
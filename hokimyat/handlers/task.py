@@ -1,3 +1,4 @@
+from typing import Dict, List, Optional, Sequence
 from aiogram import Router, F
 from aiogram.types import Message, CallbackQuery
 from aiogram.filters import Command
@@ -6,16 +7,24 @@ from states.task import TaskState, AdminTaskState
 from keyboards.reply import get_main_menu, get_cancel_kb
 from keyboards.inline import (
     get_tasks_keyboard, get_task_detail_keyboard,
-    get_admin_task_keyboard, get_task_stats_keyboard
+    get_admin_task_keyboard, get_task_stats_keyboard,
+    get_task_management_kb, get_task_status_kb, STATUS_EMOJI
 )
+from models.api import Task, TaskFile, TaskStats
 from utils.api import (
-    get_user_tasks, get_task_detail, update_task_status,
+    APIResponse, get_user_tasks, get_task_detail, update_task_status,
     submit_task_progress, get_task_stats
 )
+from utils.callbacks import Action, CallbackPayload, CallbackTable
 from utils.logger import setup_logger
+from utils.telegram import edit_markup, gather_calls
+from config import settings
 
 logger = setup_logger(__name__)
-router = Router()
+router = Router(name="task")
+callbacks = CallbackTable()
+
+TASKS_HEADER = "📋 <b>Sizning topshiriqlaringiz:</b>"
 
 def get_file_icon(file_type: str) -> str:
     icons = {
@@ -27,138 +36,227 @@ def get_file_icon(file_type: str) -> str:
     }
     return icons.get(file_type.lower(), '📄')
 
-def format_task_message(task: dict) -> str:
-    status_emoji = {
-        'pending': '⏳',
-        'in_progress': '🔄',
-        'completed': '✅',
-        'failed': '❌',
-        'cancelled': '🚫'
-    }.get(task.get('status'), '⏳')
-    
-    deadline = task.get('deadline', '').split('T')[0]
-    
+def format_task_message(task: Task) -> str:
+    status_emoji = STATUS_EMOJI.get(task.status, '⏳')
     message = (
-        f"📌 <b>{task.get('title', 'Mavjud emas')}</b>\n\n"
-        f"📝 <b>Tavsif:</b> {task.get('description', 'Mavjud emas')}\n"
-        f"👤 <b>Yaratuvchi:</b> {task.get('creator_name', 'Mavjud emas')}\n"
-        f"📅 <b>Muddati:</b> {deadline}\n"
-        f"🔄 <b>Holati:</b> {status_emoji} {task.get('status_display', 'Mavjud emas')}\n"
-        f"📊 <b>Bajarilish:</b> {task.get('percentage_count', 0)}%\n"
+        f"📌 <b>{task.title or 'Mavjud emas'}</b>\n\n"
+        f"📝 <b>Tavsif:</b> {task.description or 'Mavjud emas'}\n"
+        f"👤 <b>Yaratuvchi:</b> {task.creator_name or 'Mavjud emas'}\n"
+        f"📅 <b>Muddati:</b> {task.deadline_text}\n"
+        f"🔄 <b>Holati:</b> {status_emoji} {task.status_display or 'Mavjud emas'}\n"
+        f"📊 <b>Bajarilish:</b> {task.percentage_count}%\n"
     )
     
-    if task.get('status') == 'failed' and task.get('rejection_reason'):
-        message += f"\n❌ <b>Rad etish sababi:</b> {task['rejection_reason']}\n"
+    if task.status == 'failed' and task.rejection_reason:
+        message += f"\n❌ <b>Rad etish sababi:</b> {task.rejection_reason}\n"
     
     return message
 
-async def send_task_files(message: Message, files: list):
+async def send_task_files(message: Message, files: Sequence[TaskFile]):
     try:
         file_message = "📎 <b>Ilova qilingan fayllar:</b>\n\n"
         for i, file in enumerate(files, 1):
-            file_type = file.get('file_type', '').lower()
-            icon = get_file_icon(file_type)
+            icon = get_file_icon(file.file_type)
             file_message += (
-                f"{i}. {icon} <a href='{file.get('file_url')}'>"
-                f"{file.get('name', 'Fayl')}</a>\n"
+                f"{i}. {icon} <a href='{file.file_url}'>"
+                f"{file.name}</a>\n"
             )
         
         await message.answer(file_message, parse_mode="HTML")
     except Exception as e:
-        logger.error(f"Error sending files: {e}")
+        logger.error("Error sending files: %s", e)
         await message.answer("Fayllarni yuklashda xatolik yuz berdi.")
 
+async def fetch_updated_task(task_id: int, response: APIResponse) -> Optional[Task]:
+    """Task after a mutation, taken from the response when the backend includes it"""
+    if response.result:
+        return response.result
+
+    detail = await get_task_detail(task_id)
+    return detail.result if detail.ok else None
+
+def message_file(message: Message) -> Dict[str, str]:
+    """Telegram file reference of a document or photo message"""
+    if message.document:
+        return {
+            "file_id": message.document.file_id,
+            "name": message.document.file_name
+        }
+    return {
+        "file_id": message.photo[-1].file_id,
+        "name": f"photo_{message.photo[-1].file_id}.jpg"
+    }
+
+async def submit_progress(
+    message: Message,
+    state: FSMContext,
+    task_id: int,
+    description: str,
+    files: List[Dict[str, str]],
+    success_text: str
+):
+    """Send a progress submission and show the updated task"""
+    response = await submit_task_progress(
+        task_id,
+        message.from_user.id,
+        description,
+        files
+    )
+
+    if response.ok:
+        _, _, task = await gather_calls(
+            state.clear(),
+            message.answer(success_text, reply_markup=get_main_menu()),
+            fetch_updated_task(task_id, response)
+        )
+
+        if task:
+            await message.answer(
+                format_task_message(task),
+                reply_markup=get_task_detail_keyboard(task_id, task.status),
+                parse_mode="HTML"
+            )
+    else:
+        await message.answer(
+            "Xatolik yuz berdi. Qaytadan urinib ko'ring",
+            reply_markup=get_main_menu()
+        )
+
 @router.message(F.text == "📋 Mening topshiriqlarim")
 async def show_tasks(message: Message):
     try:
-        response, status = await get_user_tasks(message.from_user.id)
+        response = await get_user_tasks(message.from_user.id)
         
-        if status == 200 and response.get('status') == 'success':
-            tasks = response.get('tasks', [])
+        if response.ok:
+            tasks = response.result
             if not tasks:
                 await message.answer("Sizda hozircha faol topshiriqlar yo'q.")
                 return
 
-            tasks_by_status = {
-                'pending': [],
-                'in_progress': [],
-                'other': []
-            }
-            
-            for task in tasks:
-                status = task.get('status')
-                if status in ['pending', 'in_progress']:
-                    tasks_by_status[status].append(task)
-                else:
-                    tasks_by_status['other'].append(task)
-            
-            status_headers = {
-                'pending': '⏳ Kutilayotgan topshiriqlar:',
-                'in_progress': '🔄 Jarayondagi topshiriqlar:',
-                'other': '📋 Boshqa topshiriqlar:'
-            }
-            
-            for status, task_list in tasks_by_status.items():
-                if task_list:
-                    await message.answer(
-                        status_headers[status],
-                        reply_markup=get_tasks_keyboard(task_list)
-                    )
+            await message.answer(
+                TASKS_HEADER,
+                parse_mode="HTML",
+                reply_markup=get_tasks_keyboard(tasks)
+            )
         else:
             await message.answer("Topshiriqlarni olishda xatolik yuz berdi.")
     except Exception as e:
-        logger.error(f"Error in show_tasks: {e}")
+        logger.error("Error in show_tasks: %s", e)
         await message.answer("Xatolik yuz berdi. Iltimos, qaytadan urinib ko'ring.")
 
-@router.callback_query(F.data.startswith("task_view_"))
-async def process_task_view(callback: CallbackQuery):
+@router.callback_query(callbacks)
+async def dispatch_callback(
+    callback: CallbackQuery,
+    state: FSMContext,
+    callback_handler,
+    callback_payload: CallbackPayload
+):
+    """Single entry point for all task callbacks"""
+    await callback_handler(callback, state, callback_payload)
+
+@callbacks.register(Action.TASKS_PAGE)
+async def paginate_tasks(callback: CallbackQuery, state: FSMContext, payload: CallbackPayload):
+    """Switch task list page or filter in place"""
+    try:
+        # Served from the cached task list, no new message is sent
+        response = await get_user_tasks(callback.from_user.id)
+        
+        if response.ok:
+            await edit_markup(
+                callback.message,
+                get_tasks_keyboard(response.result, payload.page, payload.value)
+            )
+            await callback.answer()
+        else:
+            await callback.answer(
+                "Topshiriqlarni olishda xatolik yuz berdi.",
+                show_alert=True
+            )
+    except Exception as e:
+        logger.error("Error in paginate_tasks: %s", e)
+        await callback.answer("Xatolik yuz berdi", show_alert=True)
+
+@callbacks.register(Action.NOOP)
+async def tasks_page_counter(callback: CallbackQuery, state: FSMContext, payload: CallbackPayload):
+    await callback.answer()
+
+@callbacks.register(Action.TASKS_LIST)
+async def back_to_tasks(callback: CallbackQuery, state: FSMContext, payload: CallbackPayload):
+    """Handle back to tasks list button"""
     try:
-        task_id = int(callback.data.split('_')[2])
-        response, status = await get_task_detail(task_id)
+        response = await get_user_tasks(callback.from_user.id)
         
-        if status == 200 and response.get('status') == 'success':
-            task = response.get('task', {})
+        if response.ok:
+            await callback.message.edit_text(
+                TASKS_HEADER,
+                parse_mode="HTML",
+                reply_markup=get_tasks_keyboard(response.result)
+            )
+            await callback.answer()
+        else:
+            await callback.answer(
+                "Topshiriqlarni olishda xatolik yuz berdi.",
+                show_alert=True
+            )
+    except Exception as e:
+        logger.error("Error in back_to_tasks: %s", e)
+        await callback.answer(
+            "Xatolik yuz berdi. Iltimos, qaytadan urinib ko'ring.",
+            show_alert=True
+        )
+
+@callbacks.register(Action.TASK_VIEW)
+async def process_task_view(callback: CallbackQuery, state: FSMContext, payload: CallbackPayload):
+    try:
+        task_id = payload.task_id
+        response = await get_task_detail(task_id)
+        
+        if response.ok and response.result:
+            task = response.result
             message_text = format_task_message(task)
             keyboard = (
                 get_admin_task_keyboard(task_id)
-                if task.get('is_admin')
-                else get_task_detail_keyboard(task_id, task.get('status'))
-            )
-            
-            await callback.message.edit_text(
-                message_text,
-                reply_markup=keyboard,
-                parse_mode="HTML"
+                if task.is_admin
+                else get_task_detail_keyboard(task_id, task.status)
             )
             
-            if task.get('files'):
-                await send_task_files(callback.message, task['files'])
+            # The file list doesn't depend on the edit, send both at once
+            requests = [
+                callback.message.edit_text(
+                    message_text,
+                    reply_markup=keyboard,
+                    parse_mode="HTML"
+                )
+            ]
+            if task.files:
+                requests.append(send_task_files(callback.message, task.files))
+            await gather_calls(*requests)
         else:
             await callback.answer(
                 "Vazifa ma'lumotlarini olishda xatolik",
                 show_alert=True
             )
     except Exception as e:
-        logger.error(f"Error in process_task_view: {e}")
+        logger.error("Error in process_task_view: %s", e)
         await callback.answer(
             "Xatolik yuz berdi. Qaytadan urinib ko'ring",
             show_alert=True
         )
 
-@router.callback_query(F.data.startswith("task_stats_"))
-async def show_task_stats(callback: CallbackQuery):
+@callbacks.register(Action.TASK_STATS)
+async def show_task_stats(callback: CallbackQuery, state: FSMContext, payload: CallbackPayload):
     try:
-        task_id = int(callback.data.split('_')[2])
-        response, status = await get_task_stats(task_id)
+        task_id = payload.task_id
+        response = await get_task_stats(task_id)
         
-        if status == 200 and response.get('status') == 'success':
-            stats = response.get('stats', {})
+        if response.ok:
+            stats = response.result or TaskStats()
             message_text = (
                 f"📊 Statistika:\n\n"
-                f"✅ Bajarilgan: {stats.get('completed', 0)}\n"
-                f"🔄 Jarayonda: {stats.get('in_progress', 0)}\n"
-                f"⏳ Kutilmoqda: {stats.get('pending', 0)}\n"
-                f"❌ Rad etilgan: {stats.get('failed', 0)}"
+                f"✅ Bajarilgan: {stats.completed}\n"
+                f"🔄 Jarayonda: {stats.in_progress}\n"
+                f"⏳ Kutilmoqda: {stats.pending}\n"
+                f"❌ Rad etilgan: {stats.failed}"
             )
             await callback.message.edit_text(
                 message_text,
@@ -167,13 +265,13 @@ async def show_task_stats(callback: CallbackQuery):
         else:
             await callback.answer("Statistikani olishda xatolik", show_alert=True)
     except Exception as e:
-        logger.error(f"Error in show_task_stats: {e}")
+        logger.error("Error in show_task_stats: %s", e)
         await callback.answer("Xatolik yuz berdi", show_alert=True)
 
-@router.callback_query(F.data.startswith("task_complete_"))
-async def complete_task(callback: CallbackQuery, state: FSMContext):
+@callbacks.register(Action.TASK_COMPLETE)
+async def complete_task(callback: CallbackQuery, state: FSMContext, payload: CallbackPayload):
     try:
-        task_id = int(callback.data.split("_")[2])
+        task_id = payload.task_id
         await state.update_data(task_id=task_id)
         await state.set_state(TaskState.files)
         await callback.message.answer(
@@ -181,7 +279,7 @@ async def complete_task(callback: CallbackQuery, state: FSMContext):
             reply_markup=get_cancel_kb()
         )
     except Exception as e:
-        logger.error(f"Error in complete_task: {e}")
+        logger.error("Error in complete_task: %s", e)
         await callback.answer("Xatolik yuz berdi", show_alert=True)
 
 @router.message(TaskState.files)
@@ -200,59 +298,109 @@ async def process_task_files(message: Message, state: FSMContext):
             return
 
         data = await state.get_data()
-        task_id = data["task_id"]
-        files = []
-
-        if message.document:
-            files.append({
-                "file_id": message.document.file_id,
-                "name": message.document.file_name
-            })
-        elif message.photo:
-            files.append({
-                "file_id": message.photo[-1].file_id,
-                "name": f"photo_{message.photo[-1].file_id}.jpg"
-            })
-
-        response, status = await submit_task_progress(
-            task_id,
-            message.from_user.id,
+        await submit_progress(
+            message,
+            state,
+            data["task_id"],
             "Topshiriq bajarildi",
-            files
+            [message_file(message)],
+            "✅ Topshiriq muvaffaqiyatli yuklandi"
         )
-        
-        if status == 200 and response.get('status') == 'success':
+    except Exception as e:
+        logger.error("Error in process_task_files: %s", e)
+        await message.answer(
+            "Xatolik yuz berdi. Qaytadan urinib ko'ring",
+            reply_markup=get_main_menu()
+        )
+        await state.clear()
+
+@callbacks.register(Action.TASK_PROGRESS)
+async def start_task_report(callback: CallbackQuery, state: FSMContext, payload: CallbackPayload):
+    """Start a progress report: a description, then any number of files"""
+    try:
+        await state.update_data(task_id=payload.task_id, files=[])
+        await state.set_state(TaskState.description)
+        await gather_calls(
+            callback.message.answer(
+                "Hisobot matnini kiriting:",
+                reply_markup=get_cancel_kb()
+            ),
+            callback.answer()
+        )
+    except Exception as e:
+        logger.error("Error in start_task_report: %s", e)
+        await callback.answer("Xatolik yuz berdi", show_alert=True)
+
+@router.message(TaskState.description)
+async def process_report_description(message: Message, state: FSMContext):
+    try:
+        if message.text == "❌ Bekor qilish":
             await state.clear()
             await message.answer(
-                "✅ Topshiriq muvaffaqiyatli yuklandi",
+                "Amal bekor qilindi",
                 reply_markup=get_main_menu()
             )
-            
-            task_data, _ = await get_task_detail(task_id)
-            if task_data.get('status') == 'success':
-                task = task_data.get('task', {})
-                await message.answer(
-                    format_task_message(task),
-                    reply_markup=get_task_detail_keyboard(task_id, task.get('status')),
-                    parse_mode="HTML"
-                )
-        else:
+            return
+
+        if not message.text:
+            await message.answer("Iltimos, hisobot matnini yuboring")
+            return
+
+        await state.update_data(description=message.text)
+        await state.set_state(TaskState.report_files)
+        await message.answer(
+            "Fayllarni yuboring yoki hisobotni yakunlang",
+            reply_markup=get_cancel_kb(with_finish=True)
+        )
+    except Exception as e:
+        logger.error("Error in process_report_description: %s", e)
+        await message.answer(
+            "Xatolik yuz berdi. Qaytadan urinib ko'ring",
+            reply_markup=get_main_menu()
+        )
+        await state.clear()
+
+@router.message(TaskState.report_files)
+async def process_report_files(message: Message, state: FSMContext):
+    try:
+        if message.text == "❌ Bekor qilish":
+            await state.clear()
             await message.answer(
-                "Xatolik yuz berdi. Qaytadan urinib ko'ring",
+                "Amal bekor qilindi",
                 reply_markup=get_main_menu()
             )
+            return
+
+        data = await state.get_data()
+        if message.text == "✅ Yuborishni yakunlash":
+            await submit_progress(
+                message,
+                state,
+                data["task_id"],
+                data["description"],
+                data["files"],
+                "✅ Hisobot muvaffaqiyatli yuborildi"
+            )
+            return
+
+        if not message.document and not message.photo:
+            await message.answer("Iltimos, fayl yoki rasm yuboring")
+            return
+
+        await state.update_data(files=data["files"] + [message_file(message)])
+        await message.answer("📎 Fayl qabul qilindi")
     except Exception as e:
-        logger.error(f"Error in process_task_files: {e}")
+        logger.error("Error in process_report_files: %s", e)
         await message.answer(
             "Xatolik yuz berdi. Qaytadan urinib ko'ring",
             reply_markup=get_main_menu()
         )
         await state.clear()
 
-@router.callback_query(F.data.startswith("task_reject_"))
-async def reject_task(callback: CallbackQuery, state: FSMContext):
+@callbacks.register(Action.TASK_REJECT)
+async def reject_task(callback: CallbackQuery, state: FSMContext, payload: CallbackPayload):
     try:
-        task_id = int(callback.data.split("_")[2])
+        task_id = payload.task_id
         await state.update_data(task_id=task_id)
         await state.set_state(AdminTaskState.rejection_reason)
         await callback.message.answer(
@@ -260,7 +408,7 @@ async def reject_task(callback: CallbackQuery, state: FSMContext):
             reply_markup=get_cancel_kb()
         )
     except Exception as e:
-        logger.error(f"Error in reject_task: {e}")
+        logger.error("Error in reject_task: %s", e)
         await callback.answer("Xatolik yuz berdi", show_alert=True)
 
 @router.message(AdminTaskState.rejection_reason)
@@ -277,14 +425,14 @@ async def process_rejection_reason(message: Message, state: FSMContext):
         data = await state.get_data()
         task_id = data.get('task_id')
         
-        response, status = await update_task_status(
+        response = await update_task_status(
             task_id,
             'failed',
             message.from_user.id,
             message.text
         )
         
-        if status == 200 and response.get('status') == 'success':
+        if response.ok:
             await message.answer(
                 f"❌ Vazifa rad etildi\n\nSabab: {message.text}",
                 reply_markup=get_main_menu()
@@ -297,39 +445,119 @@ async def process_rejection_reason(message: Message, state: FSMContext):
         
         await state.clear()
     except Exception as e:
-        logger.error(f"Error in process_rejection_reason: {e}")
+        logger.error("Error in process_rejection_reason: %s", e)
         await message.answer(
             "Xatolik yuz berdi. Qaytadan urinib ko'ring",
             reply_markup=get_main_menu()
         )
         await state.clear()
 
-@router.callback_query(F.data.startswith("task_approve_"))
-async def approve_task(callback: CallbackQuery):
+@callbacks.register(Action.TASK_APPROVE)
+async def approve_task(callback: CallbackQuery, state: FSMContext, payload: CallbackPayload):
     try:
-        task_id = int(callback.data.split("_")[2])
-        response, status = await update_task_status(
+        task_id = payload.task_id
+        response = await update_task_status(
             task_id,
             "completed",
             callback.from_user.id
         )
         
-        if status == 200 and response.get('status') == 'success':
-            task_data, _ = await get_task_detail(task_id)
-            if task_data.get('status') == 'success':
-                task = task_data.get('task', {})
-                await callback.message.edit_text(
+        if response.ok:
+            task = await fetch_updated_task(task_id, response)
+            if task:
+                edit = callback.message.edit_text(
                     format_task_message(task),
                     reply_markup=get_admin_task_keyboard(task_id),
                     parse_mode="HTML"
                 )
             else:
-                await callback.message.edit_text(
+                edit = callback.message.edit_text(
                     "✅ Vazifa tasdiqlandi",
                     reply_markup=get_admin_task_keyboard(task_id)
                 )
+            await gather_calls(edit, callback.answer())
         else:
             await callback.answer("Xatolik yuz berdi", show_alert=True)
     except Exception as e:
-        logger.error(f"Error in approve_task: {e}")
-        await callback.answer("Xatolik yuz berdi", show_alert=True)
\ No newline at end of file
+        logger.error("Error in approve_task: %s", e)
+        await callback.answer("Xatolik yuz berdi", show_alert=True)
+
+@router.message(Command("tasks"))
+async def cmd_tasks(message: Message):
+    """Handle /tasks command for admins"""
+    if message.from_user.id not in settings.admin_ids:
+        await message.answer("Bu buyruq faqat adminlar uchun.")
+        return
+
+    try:
+        response = await get_user_tasks(message.from_user.id)
+        if response.ok:
+            task_list = response.result
+            if task_list:
+                await message.answer(
+                    "Mavjud topshiriqlar:",
+                    reply_markup=get_task_management_kb(task_list)
+                )
+            else:
+                await message.answer("Hozircha topshiriqlar yo'q.")
+        else:
+            await message.answer("Topshiriqlarni olishda xatolik yuz berdi.")
+    except Exception as e:
+        logger.error("Error in tasks command: %s", e)
+        await message.answer("Xatolik yuz berdi. Iltimos, qaytadan urinib ko'ring.")
+
+@callbacks.register(Action.TASK_STATUS)
+async def choose_task_status(callback: CallbackQuery, state: FSMContext, payload: CallbackPayload):
+    """Show status choices for admin task management"""
+    if callback.from_user.id not in settings.admin_ids:
+        await callback.answer("Bu amal faqat adminlar uchun.", show_alert=True)
+        return
+
+    try:
+        task_id = payload.task_id
+        await callback.message.edit_reply_markup(
+            reply_markup=get_task_status_kb(task_id)
+        )
+    except Exception as e:
+        logger.error("Error in choose_task_status: %s", e)
+        await callback.answer(
+            "Xatolik yuz berdi. Qaytadan urinib ko'ring.",
+            show_alert=True
+        )
+
+@callbacks.register(Action.TASK_MARK)
+async def mark_task(callback: CallbackQuery, state: FSMContext, payload: CallbackPayload):
+    """Set task status from admin task management"""
+    if callback.from_user.id not in settings.admin_ids:
+        await callback.answer("Bu amal faqat adminlar uchun.", show_alert=True)
+        return
+
+    try:
+        response = await update_task_status(
+            payload.task_id,
+            payload.status,
+            callback.from_user.id
+        )
+        
+        if response.ok:
+            await callback.answer(
+                "Topshiriq statusi muvaffaqiyatli o'zgartirildi!",
+                show_alert=True
+            )
+            # Update task list
+            tasks = await get_user_tasks(callback.from_user.id)
+            if tasks.ok:
+                await callback.message.edit_reply_markup(
+                    reply_markup=get_task_management_kb(tasks.result)
+                )
+        else:
+            await callback.answer(
+                "Xatolik yuz berdi. Qaytadan urinib ko'ring.",
+                show_alert=True
+            )
+    except Exception as e:
+        logger.error("Error in mark_task: %s", e)
+        await callback.answer(
+            "Xatolik yuz berdi. Qaytadan urinib ko'ring.",
+            show_alert=True
+        )
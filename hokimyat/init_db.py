@@ -20,7 +20,7 @@ def init_database():
         for name, id in mahallas.items():
             if not db.query(Mahalla).filter(Mahalla.name == name).first():
                 db.add(Mahalla(id=id, name=name))
-                logger.info(f"Mahalla qo'shildi: {name}")
+                logger.info("Mahalla qo'shildi: %s", name)
         
         # Add main admins
         main_admins = [
@@ -47,12 +47,12 @@ def init_database():
         for admin in main_admins:
             if not db.query(User).filter(User.phone_number == admin["phone_number"]).first():
                 db.add(User(**admin))
-                logger.info(f"Bosh admin qo'shildi: {admin['username']}")
+                logger.info("Bosh admin qo'shildi: %s", admin['username'])
         
         db.commit()
         logger.info("Ma'lumotlar bazasi muvaffaqiyatli yaratildi")
     except Exception as e:
-        logger.error(f"Ma'lumotlar bazasini yaratishda xatolik: {e}")
+        logger.error("Ma'lumotlar bazasini yaratishda xatolik: %s", e)
         db.rollback()
     finally:
         db.close()
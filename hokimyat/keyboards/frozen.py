@@ -0,0 +1,34 @@
+"""Immutable keyboard types for markups that are built once and shared
+
+aiogram types are mutable pydantic models, so a memoized or module-level
+keyboard would be changed for every user if one handler edited it. These
+subclasses are frozen and keep rows in tuples: assigning a field or
+appending a row raises instead.
+"""
+from typing import Tuple
+from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup, KeyboardButton, ReplyKeyboardMarkup
+from pydantic import ConfigDict, field_serializer
+
+def _rows_as_lists(rows, handler):
+    # aiogram only walks lists when dropping unset (None) fields from a request
+    return [list(row) for row in handler(rows)]
+
+class FrozenInlineKeyboardButton(InlineKeyboardButton):
+    model_config = ConfigDict(frozen=True)
+
+class FrozenInlineKeyboardMarkup(InlineKeyboardMarkup):
+    model_config = ConfigDict(frozen=True)
+
+    inline_keyboard: Tuple[Tuple[FrozenInlineKeyboardButton, ...], ...]
+
+    _serialize_rows = field_serializer('inline_keyboard', mode='wrap')(_rows_as_lists)
+
+class FrozenKeyboardButton(KeyboardButton):
+    model_config = ConfigDict(frozen=True)
+
+class FrozenReplyKeyboardMarkup(ReplyKeyboardMarkup):
+    model_config = ConfigDict(frozen=True)
+
+    keyboard: Tuple[Tuple[FrozenKeyboardButton, ...], ...]
+
+    _serialize_rows = field_serializer('keyboard', mode='wrap')(_rows_as_lists)
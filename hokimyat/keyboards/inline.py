@@ -1,24 +1,78 @@
 from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
-from typing import List, Dict, Any
+from functools import lru_cache
+from typing import List
+from models.api import Task
+from utils.callbacks import Action, pack, status_code
+from config import settings
+from keyboards.frozen import FrozenInlineKeyboardButton, FrozenInlineKeyboardMarkup
 
-def get_tasks_keyboard(tasks: List[Dict[str, Any]]) -> InlineKeyboardMarkup:
-    """Generate keyboard with tasks"""
-    keyboard = []
-    
-    for task in tasks:
-        task_id = task.get('id')
-        title = task.get('title')
-        status = task.get('status')
-        deadline = task.get('deadline', '').split('T')[0]
-        
-        # Add emoji based on status
-        status_emoji = {
-            'pending': '⏳',
-            'in_progress': '🔄',
-            'completed': '✅',
-            'failed': '❌',
-            'cancelled': '🚫'
-        }.get(status, '⏳')
+TASKS_PAGE_SIZE = 8
+
+STATUS_EMOJI = {
+    'pending': '⏳',
+    'in_progress': '🔄',
+    'completed': '✅',
+    'failed': '❌',
+    'cancelled': '🚫'
+}
+
+# Status filters for the task list
+FILTER_ALL = 0
+FILTER_PENDING = 1
+FILTER_IN_PROGRESS = 2
+FILTER_OTHER = 3
+
+TASK_FILTERS = {
+    FILTER_ALL: "📋",
+    FILTER_PENDING: "⏳",
+    FILTER_IN_PROGRESS: "🔄",
+    FILTER_OTHER: "📁"
+}
+
+def filter_tasks(tasks: List[Task], status_filter: int = FILTER_ALL) -> List[Task]:
+    """Select tasks matching a status filter code"""
+    if status_filter == FILTER_PENDING:
+        return [task for task in tasks if task.status == 'pending']
+    if status_filter == FILTER_IN_PROGRESS:
+        return [task for task in tasks if task.status == 'in_progress']
+    if status_filter == FILTER_OTHER:
+        return [
+            task for task in tasks
+            if task.status not in ('pending', 'in_progress')
+        ]
+    return tasks
+
+def get_tasks_keyboard(
+    tasks: List[Task],
+    page: int = 0,
+    status_filter: int = FILTER_ALL
+) -> InlineKeyboardMarkup:
+    """Generate one page of the task list with filter and navigation rows"""
+    if status_filter not in TASK_FILTERS:
+        status_filter = FILTER_ALL
+
+    # Filter row with per-status counters, active filter is marked
+    keyboard = [[
+        InlineKeyboardButton(
+            text=(
+                f"{'• ' if code == status_filter else ''}"
+                f"{label} {len(filter_tasks(tasks, code))}"
+            ),
+            callback_data=pack(Action.TASKS_PAGE, value=code)
+        )
+        for code, label in TASK_FILTERS.items()
+    ]]
+
+    filtered = filter_tasks(tasks, status_filter)
+    pages = max(1, -(-len(filtered) // TASKS_PAGE_SIZE))
+    page = min(max(page, 0), pages - 1)
+    start = page * TASKS_PAGE_SIZE
+
+    for task in filtered[start:start + TASKS_PAGE_SIZE]:
+        task_id = task.id
+        title = task.title or ''
+        deadline = task.deadline_text
+        status_emoji = STATUS_EMOJI.get(task.status, '⏳')
         
         # Truncate title if too long
         if len(title) > 30:
@@ -27,94 +81,157 @@ def get_tasks_keyboard(tasks: List[Dict[str, Any]]) -> InlineKeyboardMarkup:
         keyboard.append([
             InlineKeyboardButton(
                 text=f"{status_emoji} {title} ({deadline})",
-                callback_data=f"task_view_{task_id}"
+                callback_data=pack(Action.TASK_VIEW, task_id)
             )
         ])
+
+    if pages > 1:
+        navigation = []
+        if page > 0:
+            navigation.append(InlineKeyboardButton(
+                text="◀️",
+                callback_data=pack(Action.TASKS_PAGE, page=page - 1, value=status_filter)
+            ))
+        navigation.append(InlineKeyboardButton(
+            text=f"{page + 1}/{pages}",
+            callback_data=pack(Action.NOOP)
+        ))
+        if page < pages - 1:
+            navigation.append(InlineKeyboardButton(
+                text="▶️",
+                callback_data=pack(Action.TASKS_PAGE, page=page + 1, value=status_filter)
+            ))
+        keyboard.append(navigation)
     
     return InlineKeyboardMarkup(inline_keyboard=keyboard)
 
+@lru_cache(maxsize=settings.keyboard_cache_size)
 def get_task_detail_keyboard(task_id: int, status: str = 'pending') -> InlineKeyboardMarkup:
-    """Generate keyboard for task details"""
+    """Generate keyboard for task details, memoized by task and status
+
+    The result is shared between callers, so it is built frozen.
+    """
     keyboard = []
     
     # Show action buttons only for pending or in_progress tasks
     if status in ['pending', 'in_progress']:
         keyboard.extend([
             [
-                InlineKeyboardButton(
+                FrozenInlineKeyboardButton(
                     text="✅ Bajarildi deb belgilash",
-                    callback_data=f"task_complete_{task_id}"
+                    callback_data=pack(Action.TASK_COMPLETE, task_id)
                 )
             ],
             [
-                InlineKeyboardButton(
+                FrozenInlineKeyboardButton(
                     text="📝 Hisobot yuborish",
-                    callback_data=f"task_progress_{task_id}"
+                    callback_data=pack(Action.TASK_PROGRESS, task_id)
                 )
             ]
         ])
     
     keyboard.extend([
         [
-            InlineKeyboardButton(
+            FrozenInlineKeyboardButton(
                 text="📊 Statistika",
-                callback_data=f"task_stats_{task_id}"
+                callback_data=pack(Action.TASK_STATS, task_id)
             )
         ],
         [
-            InlineKeyboardButton(
+            FrozenInlineKeyboardButton(
                 text="⬅️ Orqaga",
-                callback_data="tasks_list"
+                callback_data=pack(Action.TASKS_LIST)
             )
         ]
     ])
     
-    return InlineKeyboardMarkup(inline_keyboard=keyboard)
+    return FrozenInlineKeyboardMarkup(inline_keyboard=keyboard)
 
+@lru_cache(maxsize=settings.keyboard_cache_size)
 def get_admin_task_keyboard(task_id: int) -> InlineKeyboardMarkup:
     """Generate keyboard for admin task management"""
     keyboard = [
         [
-            InlineKeyboardButton(
+            FrozenInlineKeyboardButton(
                 text="✅ Tasdiqlash",
-                callback_data=f"task_approve_{task_id}"
+                callback_data=pack(Action.TASK_APPROVE, task_id)
             ),
-            InlineKeyboardButton(
+            FrozenInlineKeyboardButton(
                 text="❌ Rad etish",
-                callback_data=f"task_reject_{task_id}"
+                callback_data=pack(Action.TASK_REJECT, task_id)
             )
         ],
         [
-            InlineKeyboardButton(
+            FrozenInlineKeyboardButton(
                 text="📊 Statistika",
-                callback_data=f"task_stats_{task_id}"
+                callback_data=pack(Action.TASK_STATS, task_id)
             )
         ],
         [
-            InlineKeyboardButton(
+            FrozenInlineKeyboardButton(
                 text="⬅️ Orqaga",
-                callback_data="tasks_list"
+                callback_data=pack(Action.TASKS_LIST)
             )
         ]
     ]
     
-    return InlineKeyboardMarkup(inline_keyboard=keyboard)
+    return FrozenInlineKeyboardMarkup(inline_keyboard=keyboard)
 
+@lru_cache(maxsize=settings.keyboard_cache_size)
 def get_task_stats_keyboard(task_id: int) -> InlineKeyboardMarkup:
     """Generate keyboard for task statistics"""
     keyboard = [
         [
-            InlineKeyboardButton(
+            FrozenInlineKeyboardButton(
                 text="🔄 Yangilash",
-                callback_data=f"task_stats_{task_id}"
+                callback_data=pack(Action.TASK_STATS, task_id)
             )
         ],
         [
-            InlineKeyboardButton(
+            FrozenInlineKeyboardButton(
                 text="⬅️ Vazifaga qaytish",
-                callback_data=f"task_view_{task_id}"
+                callback_data=pack(Action.TASK_VIEW, task_id)
+            )
+        ]
+    ]
+    
+    return FrozenInlineKeyboardMarkup(inline_keyboard=keyboard)
+
+TASK_STATUS_LABELS = {
+    'pending': "⏳ Kutilmoqda",
+    'in_progress': "🔄 Jarayonda",
+    'completed': "✅ Bajarildi",
+    'failed': "❌ Rad etildi"
+}
+
+def get_task_management_kb(tasks: List[Task]) -> InlineKeyboardMarkup:
+    """Generate admin keyboard listing tasks for status management"""
+    keyboard = []
+
+    for task in tasks:
+        title = task.title or ''
+        if len(title) > 30:
+            title = title[:27] + "..."
+
+        keyboard.append([
+            InlineKeyboardButton(
+                text=f"{STATUS_EMOJI.get(task.status, '⏳')} {title}",
+                callback_data=pack(Action.TASK_STATUS, task.id)
+            )
+        ])
+
+    return InlineKeyboardMarkup(inline_keyboard=keyboard)
+
+def get_task_status_kb(task_id: int) -> InlineKeyboardMarkup:
+    """Generate admin keyboard with status choices for a task"""
+    keyboard = [
+        [
+            InlineKeyboardButton(
+                text=label,
+                callback_data=pack(Action.TASK_MARK, task_id, value=status_code(status))
             )
         ]
+        for status, label in TASK_STATUS_LABELS.items()
     ]
     
-    return InlineKeyboardMarkup(inline_keyboard=keyboard)
\ No newline at end of file
+    return InlineKeyboardMarkup(inline_keyboard=keyboard)
@@ -1,44 +1,65 @@
-from aiogram.types import ReplyKeyboardMarkup, KeyboardButton, ReplyKeyboardRemove
+from aiogram.types import ReplyKeyboardMarkup, ReplyKeyboardRemove
+from keyboards.frozen import FrozenReplyKeyboardMarkup, FrozenKeyboardButton
 
-def get_phone_number_kb() -> ReplyKeyboardMarkup:
-    """Generate keyboard with phone number request button"""
-    keyboard = [
+# Static keyboards are built once and shared, so they use the frozen types
+PHONE_NUMBER_KB = FrozenReplyKeyboardMarkup(
+    keyboard=[
         [
-            KeyboardButton(
+            FrozenKeyboardButton(
                 text="📱 Telefon raqamni yuborish",
                 request_contact=True
             )
         ]
-    ]
-    return ReplyKeyboardMarkup(keyboard=keyboard, resize_keyboard=True, one_time_keyboard=True)
+    ],
+    resize_keyboard=True,
+    one_time_keyboard=True
+)
 
-def get_main_menu() -> ReplyKeyboardMarkup:
-    """Generate main menu keyboard"""
-    keyboard = [
+MAIN_MENU_KB = FrozenReplyKeyboardMarkup(
+    keyboard=[
+        [
+            FrozenKeyboardButton(text="📋 Mening topshiriqlarim")
+        ],
         [
-            KeyboardButton(text="📋 Mening topshiriqlarim")
+            FrozenKeyboardButton(text="📊 Statistika"),
+            FrozenKeyboardButton(text="⚙️ Sozlamalar")
         ],
         [
-            KeyboardButton(text="📊 Statistika"),
-            KeyboardButton(text="⚙️ Sozlamalar")
+            FrozenKeyboardButton(text="📞 Yordam")
+        ]
+    ],
+    resize_keyboard=True
+)
+
+CANCEL_KB = FrozenReplyKeyboardMarkup(
+    keyboard=[
+        [
+            FrozenKeyboardButton(text="❌ Bekor qilish")
+        ]
+    ],
+    resize_keyboard=True
+)
+
+CANCEL_FINISH_KB = FrozenReplyKeyboardMarkup(
+    keyboard=[
+        [
+            FrozenKeyboardButton(text="✅ Yuborishni yakunlash")
         ],
         [
-            KeyboardButton(text="📞 Yordam")
+            FrozenKeyboardButton(text="❌ Bekor qilish")
         ]
-    ]
-    return ReplyKeyboardMarkup(keyboard=keyboard, resize_keyboard=True)
+    ],
+    resize_keyboard=True
+)
+
+def get_phone_number_kb() -> ReplyKeyboardMarkup:
+    """Keyboard with phone number request button"""
+    return PHONE_NUMBER_KB
+
+def get_main_menu() -> ReplyKeyboardMarkup:
+    """Main menu keyboard"""
+    return MAIN_MENU_KB
 
 def get_cancel_kb(with_finish: bool = False) -> ReplyKeyboardMarkup:
-    """Generate cancel keyboard"""
-    keyboard = []
-    
-    if with_finish:
-        keyboard.append([
-            KeyboardButton(text="✅ Yuborishni yakunlash")
-        ])
-        
-    keyboard.append([
-        KeyboardButton(text="❌ Bekor qilish")
-    ])
-    
-    return ReplyKeyboardMarkup(keyboard=keyboard, resize_keyboard=True)
\ No newline at end of file
+    """Cancel keyboard, optionally with finish button"""
+    return CANCEL_FINISH_KB if with_finish else CANCEL_KB
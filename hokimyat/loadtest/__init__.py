@@ -0,0 +1,4 @@
+"""Offline load testing: fake Telegram Bot API, fake backend and a scenario runner
+
+Run from the bot directory: ``python -m loadtest.runner --users 1000``
+"""
@@ -0,0 +1,129 @@
+from collections import Counter
+from typing import Any, Dict, List, Optional
+from aiohttp import web
+from loadtest.server import Faults, FakeServer
+
+STATUSES = ('pending', 'in_progress', 'completed', 'failed', 'cancelled')
+STATUS_DISPLAY = {
+    'pending': "Kutilmoqda",
+    'in_progress': "Jarayonda",
+    'completed': "Bajarilgan",
+    'failed': "Rad etilgan",
+    'cancelled': "Bekor qilingan"
+}
+
+def make_task(task_id: int) -> Dict[str, Any]:
+    status = STATUSES[task_id % len(STATUSES)]
+    return {
+        'id': task_id,
+        'title': f"Topshiriq #{task_id}",
+        'description': "Mahalla bo'yicha oylik hisobotni tayyorlash",
+        'creator_name': "Hokimlik",
+        'deadline': f"2024-03-{task_id % 28 + 1:02d}T18:00:00",
+        'status': status,
+        'status_display': STATUS_DISPLAY[status],
+        'percentage_count': task_id * 7 % 100,
+        'files': [{
+            'file_url': f"https://example.com/files/{task_id}.pdf",
+            'name': f"{task_id}.pdf",
+            'file_type': 'pdf'
+        }]
+    }
+
+class FakeBackend(FakeServer):
+    """In-memory stand-in for the API_URL backend
+
+    Users become registered after ``verify-user``; every user sees the
+    same ``tasks`` tasks so cached task details are shared as in production.
+    """
+    def __init__(self, faults: Faults = Faults(), tasks: int = 20):
+        super().__init__(faults)
+        self.calls: Counter = Counter()
+        self.users: Dict[int, Dict[str, Any]] = {}
+        self.tasks: List[Dict[str, Any]] = [make_task(task_id) for task_id in range(1, tasks + 1)]
+        self._tasks_by_id = {task['id']: task for task in self.tasks}
+
+    async def _begin(self, name: str) -> Optional[web.Response]:
+        """Count and delay the request; returns an error response when one is injected"""
+        self.calls[name] += 1
+        await self.faults.delay()
+        if self.faults.should_fail():
+            return web.json_response({'status': 'error', 'message': "Internal server error"}, status=500)
+        return None
+
+    async def user_info(self, request: web.Request) -> web.Response:
+        error = await self._begin('user-info')
+        if error is not None:
+            return error
+        user = self.users.get(int(request.query.get('telegram_id', 0)))
+        if user is None:
+            return web.json_response({'status': 'error', 'message': "Foydalanuvchi topilmadi"}, status=404)
+        return web.json_response({'status': 'success', 'user': user})
+
+    async def verify_user(self, request: web.Request) -> web.Response:
+        error = await self._begin('verify-user')
+        if error is not None:
+            return error
+        data = await request.json()
+        telegram_id = int(data['telegram_id'])
+        user = self.users[telegram_id] = {
+            'telegram_id': telegram_id,
+            'full_name': f"Foydalanuvchi {telegram_id}",
+            'phone': data['phone'],
+            'job_title_name': "Mahalla raisi",
+            'mahalla_name': "Navbahor",
+            'tuman_name': "Chilonzor"
+        }
+        return web.json_response({'status': 'success', 'user': user})
+
+    async def user_tasks(self, request: web.Request) -> web.Response:
+        error = await self._begin('tasks')
+        if error is not None:
+            return error
+        return web.json_response({'status': 'success', 'tasks': self.tasks})
+
+    async def task_detail(self, request: web.Request) -> web.Response:
+        error = await self._begin('tasks/{id}')
+        if error is not None:
+            return error
+        task = self._tasks_by_id.get(int(request.match_info['task_id']))
+        if task is None:
+            return web.json_response({'status': 'error', 'message': "Topshiriq topilmadi"}, status=404)
+        return web.json_response({'status': 'success', 'task': task})
+
+    async def task_stats(self, request: web.Request) -> web.Response:
+        error = await self._begin('tasks/{id}/stats')
+        if error is not None:
+            return error
+        task_id = int(request.match_info['task_id'])
+        stats = {status: (task_id + index) % 10 for index, status in enumerate(STATUSES)}
+        return web.json_response({'status': 'success', 'stats': stats})
+
+    async def task_status(self, request: web.Request) -> web.Response:
+        error = await self._begin('tasks/{id}/status')
+        if error is not None:
+            return error
+        await request.json()
+        return web.json_response({'status': 'success'})
+
+    async def submit_progress(self, request: web.Request) -> web.Response:
+        error = await self._begin('submit-progress')
+        if error is not None:
+            return error
+        form = await request.post()
+        task = self._tasks_by_id.get(int(form.get('task_id', 0)))
+        response = {'status': 'success'}
+        if task:
+            response['task'] = task
+        return web.json_response(response)
+
+    def make_app(self) -> web.Application:
+        app = web.Application(client_max_size=64 * 1024 * 1024)
+        app.router.add_get('/api/user-info/', self.user_info)
+        app.router.add_post('/api/verify-user/', self.verify_user)
+        app.router.add_get('/api/tasks/', self.user_tasks)
+        app.router.add_get('/api/tasks/{task_id}/', self.task_detail)
+        app.router.add_get('/api/tasks/{task_id}/stats/', self.task_stats)
+        app.router.add_patch('/api/tasks/{task_id}/status/', self.task_status)
+        app.router.add_post('/api/submit-progress/', self.submit_progress)
+        return app
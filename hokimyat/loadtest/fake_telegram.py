@@ -0,0 +1,91 @@
+import itertools
+import json
+import time
+from collections import Counter
+from typing import Any, Dict
+from aiohttp import web
+from loadtest.server import Faults, FakeServer
+
+# Content served for every file download
+FILE_CONTENT = b"%PDF-1.4\n" + b"0" * 16 * 1024
+
+def _ok(result: Any) -> web.Response:
+    return web.json_response({'ok': True, 'result': result})
+
+class FakeTelegramServer(FakeServer):
+    """Bot API server answering the methods the bot uses
+
+    Messages are echoed back as if Telegram accepted them. Replies that
+    tell the user something went wrong are counted so a run can report
+    how often handlers hit their error path.
+    """
+    def __init__(self, faults: Faults = Faults()):
+        super().__init__(faults)
+        self.calls: Counter = Counter()
+        self.error_replies = 0
+        self._message_ids = itertools.count(1_000_000)
+
+    def _count_error_reply(self, text: str):
+        if text and 'xatolik' in text.lower():
+            self.error_replies += 1
+
+    def _message(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        text = params.get('text')
+        self._count_error_reply(text)
+        message = {
+            'message_id': int(params.get('message_id') or next(self._message_ids)),
+            'date': int(time.time()),
+            'chat': {'id': int(params.get('chat_id', 0)), 'type': 'private'}
+        }
+        if text:
+            message['text'] = text
+        if params.get('reply_markup'):
+            markup = json.loads(params['reply_markup'])
+            if 'inline_keyboard' in markup:
+                message['reply_markup'] = markup
+        return message
+
+    def _get_file(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        file_id = params['file_id']
+        return {
+            'file_id': file_id,
+            'file_unique_id': file_id,
+            'file_size': len(FILE_CONTENT),
+            'file_path': f"documents/{file_id}.pdf"
+        }
+
+    async def handle_method(self, request: web.Request) -> web.Response:
+        method = request.match_info['method']
+        self.calls[method] += 1
+        params = dict(await request.post())
+        await self.faults.delay()
+
+        if self.faults.should_fail():
+            return web.json_response({
+                'ok': False,
+                'error_code': 429,
+                'description': "Too Many Requests: retry after 1",
+                'parameters': {'retry_after': 1}
+            }, status=429)
+
+        if method in ('sendMessage', 'editMessageText', 'editMessageReplyMarkup'):
+            return _ok(self._message(params))
+        if method == 'getFile':
+            return _ok(self._get_file(params))
+        if method == 'getMe':
+            return _ok({'id': 123456, 'is_bot': True, 'first_name': 'Hokimyat', 'username': 'hokimyat_bot'})
+        if method == 'answerCallbackQuery':
+            self._count_error_reply(params.get('text'))
+        # answerCallbackQuery, deleteMessage, deleteWebhook, ...
+        return _ok(True)
+
+    async def handle_file(self, request: web.Request) -> web.Response:
+        self.calls['file'] += 1
+        await self.faults.delay()
+        return web.Response(body=FILE_CONTENT, content_type='application/pdf')
+
+    def make_app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_post('/bot{token}/{method}', self.handle_method)
+        app.router.add_get('/file/bot{token}/{path:.+}', self.handle_file)
+        return app
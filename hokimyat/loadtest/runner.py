@@ -0,0 +1,184 @@
+"""Replay synthetic users through the real dispatcher against fake servers
+
+Each user logs in, opens the task list and a task, and uploads a report.
+Both the Telegram Bot API and the backend are served from this process,
+so the numbers show the bot's own overhead plus the injected latency.
+
+Run from the bot directory::
+
+    python -m loadtest.runner --users 2000 --concurrency 200 --api-latency 0.03
+"""
+import argparse
+import asyncio
+import logging
+import statistics
+import time
+import tracemalloc
+from collections import defaultdict
+from typing import Dict, List, NamedTuple, Optional
+from aiogram import Bot
+from aiogram.client.session.aiohttp import AiohttpSession
+from aiogram.client.telegram import TelegramAPIServer
+from bot import create_dispatcher, instrument_bot
+from loadtest.fake_backend import FakeBackend
+from loadtest.fake_telegram import FakeTelegramServer
+from loadtest.scenario import FIRST_USER_ID, UpdateFactory, user_journey
+from loadtest.server import Faults
+from utils.api import APIClient, api_client
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Any well-formed token works against the fake server
+LOADTEST_TOKEN = "123456:LOADTEST"
+
+class Options(NamedTuple):
+    users: int = 1000
+    concurrency: int = 100
+    tasks: int = 20
+    telegram: Faults = Faults()
+    backend: Faults = Faults()
+    trace_memory: bool = False
+
+class Report(NamedTuple):
+    updates: int
+    elapsed: float
+    latencies: Dict[str, List[float]]
+    failed_updates: int
+    error_replies: int
+    telegram_calls: int
+    backend_calls: int
+    peak_rss_mb: Optional[float]
+    peak_traced_mb: Optional[float]
+
+    @property
+    def updates_per_second(self) -> float:
+        return self.updates / self.elapsed if self.elapsed else 0.0
+
+def percentiles(samples: List[float]) -> Dict[str, float]:
+    """p50/p95/p99 of latencies in seconds, returned in milliseconds"""
+    if len(samples) < 2:
+        value = samples[0] * 1000 if samples else 0.0
+        return {'p50': value, 'p95': value, 'p99': value}
+    cuts = statistics.quantiles(samples, n=100, method='inclusive')
+    return {'p50': cuts[49] * 1000, 'p95': cuts[94] * 1000, 'p99': cuts[98] * 1000}
+
+def _peak_rss_mb() -> Optional[float]:
+    if resource is None:
+        return None
+    # ru_maxrss is in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+async def run(options: Options) -> Report:
+    """Start fake servers, replay ``options.users`` journeys and collect timings"""
+    telegram = FakeTelegramServer(options.telegram)
+    backend = FakeBackend(options.backend, tasks=options.tasks)
+    await asyncio.gather(telegram.start(), backend.start())
+
+    session = AiohttpSession(api=TelegramAPIServer.from_base(telegram.url))
+    bot = instrument_bot(Bot(token=LOADTEST_TOKEN, session=session))
+    dp = create_dispatcher()
+    factory = UpdateFactory(bot)
+
+    # Point the shared API client at the fake backend and fake file server
+    api_client.base_url = backend.url
+    APIClient._bot = bot
+
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    failed = 0
+    semaphore = asyncio.Semaphore(options.concurrency)
+
+    async def replay(user_id: int):
+        nonlocal failed
+        async with semaphore:
+            for step, update in user_journey(factory, user_id, options.tasks):
+                start = time.perf_counter()
+                try:
+                    await dp.feed_update(bot, update)
+                except Exception:
+                    failed += 1
+                latencies[step].append(time.perf_counter() - start)
+
+    if options.trace_memory:
+        tracemalloc.start()
+    started = time.perf_counter()
+    try:
+        await asyncio.gather(*(replay(FIRST_USER_ID + index) for index in range(options.users)))
+        elapsed = time.perf_counter() - started
+    finally:
+        peak_traced = None
+        if options.trace_memory:
+            peak_traced = tracemalloc.get_traced_memory()[1] / 1024 / 1024
+            tracemalloc.stop()
+        await APIClient.close()
+        await asyncio.gather(telegram.stop(), backend.stop())
+
+    return Report(
+        updates=sum(len(samples) for samples in latencies.values()),
+        elapsed=elapsed,
+        latencies=dict(latencies),
+        failed_updates=failed,
+        error_replies=telegram.error_replies,
+        telegram_calls=sum(telegram.calls.values()),
+        backend_calls=sum(backend.calls.values()),
+        peak_rss_mb=_peak_rss_mb(),
+        peak_traced_mb=peak_traced
+    )
+
+def format_report(report: Report) -> str:
+    lines = [
+        f"updates:         {report.updates} in {report.elapsed:.2f} s",
+        f"throughput:      {report.updates_per_second:.1f} updates/s",
+        f"failed updates:  {report.failed_updates}",
+        f"error replies:   {report.error_replies}",
+        f"telegram calls:  {report.telegram_calls}",
+        f"backend calls:   {report.backend_calls}"
+    ]
+    if report.peak_rss_mb is not None:
+        lines.append(f"peak RSS:        {report.peak_rss_mb:.1f} MB")
+    if report.peak_traced_mb is not None:
+        lines.append(f"peak traced:     {report.peak_traced_mb:.1f} MB")
+
+    lines.append("")
+    lines.append(f"{'step':<15}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    all_samples = []
+    for step, samples in report.latencies.items():
+        all_samples.extend(samples)
+        cuts = percentiles(samples)
+        lines.append(f"{step:<15}{cuts['p50']:>10.1f}{cuts['p95']:>10.1f}{cuts['p99']:>10.1f}")
+    cuts = percentiles(all_samples)
+    lines.append(f"{'all':<15}{cuts['p50']:>10.1f}{cuts['p95']:>10.1f}{cuts['p99']:>10.1f}")
+    return '\n'.join(lines)
+
+def parse_args(argv=None) -> Options:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--users', type=int, default=1000, help="synthetic users to replay")
+    parser.add_argument('--concurrency', type=int, default=100, help="users active at the same time")
+    parser.add_argument('--tasks', type=int, default=20, help="tasks returned by the fake backend")
+    parser.add_argument('--telegram-latency', type=float, default=0.0, help="seconds per Bot API call")
+    parser.add_argument('--api-latency', type=float, default=0.0, help="seconds per backend call")
+    parser.add_argument('--jitter', type=float, default=0.0, help="extra random latency, seconds")
+    parser.add_argument('--telegram-error-rate', type=float, default=0.0, help="share of 429 replies")
+    parser.add_argument('--api-error-rate', type=float, default=0.0, help="share of backend 500 replies")
+    parser.add_argument('--trace-memory', action='store_true', help="track peak allocations with tracemalloc")
+    args = parser.parse_args(argv)
+    return Options(
+        users=args.users,
+        concurrency=args.concurrency,
+        tasks=args.tasks,
+        telegram=Faults(args.telegram_latency, args.jitter, args.telegram_error_rate),
+        backend=Faults(args.api_latency, args.jitter, args.api_error_rate),
+        trace_memory=args.trace_memory
+    )
+
+def main(argv=None):
+    options = parse_args(argv)
+    # Per-update INFO lines from aiogram would dominate the run
+    logging.getLogger().setLevel(logging.WARNING)
+    report = asyncio.run(run(options))
+    print(format_report(report))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+import itertools
+import time
+from typing import Any, Dict, List, Tuple
+from aiogram import Bot
+from aiogram.types import Update
+from utils.callbacks import Action, pack
+
+MAIN_MENU_TASKS = "📋 Mening topshiriqlarim"
+
+# First synthetic Telegram user id, far from real ones
+FIRST_USER_ID = 7_000_000_000
+
+class UpdateFactory:
+    """Builds Telegram updates bound to a bot, as polling would deliver them"""
+    def __init__(self, bot: Bot):
+        self.bot = bot
+        self._update_ids = itertools.count(1)
+        self._message_ids = itertools.count(1)
+
+    @staticmethod
+    def _user(user_id: int) -> Dict[str, Any]:
+        return {'id': user_id, 'is_bot': False, 'first_name': f"User {user_id}"}
+
+    def _message(self, user_id: int, **fields) -> Dict[str, Any]:
+        return {
+            'message_id': next(self._message_ids),
+            'date': int(time.time()),
+            'chat': {'id': user_id, 'type': 'private'},
+            'from': self._user(user_id),
+            **fields
+        }
+
+    def _update(self, **fields) -> Update:
+        return Update.model_validate(
+            {'update_id': next(self._update_ids), **fields},
+            context={'bot': self.bot}
+        )
+
+    def message(self, user_id: int, **fields) -> Update:
+        return self._update(message=self._message(user_id, **fields))
+
+    def callback(self, user_id: int, data: str) -> Update:
+        return self._update(callback_query={
+            'id': str(next(self._update_ids)),
+            'from': self._user(user_id),
+            'chat_instance': str(user_id),
+            'data': data,
+            'message': {
+                'message_id': next(self._message_ids),
+                'date': int(time.time()),
+                'chat': {'id': user_id, 'type': 'private'},
+                'text': "📋"
+            }
+        })
+
+def user_journey(factory: UpdateFactory, user_id: int, tasks: int) -> List[Tuple[str, Update]]:
+    """Updates sent by one new user: login, open a task and upload a report"""
+    task_id = user_id % tasks + 1
+    return [
+        ('start', factory.message(user_id, text="/start")),
+        ('phone', factory.message(user_id, contact={
+            'phone_number': f"+99890{user_id % 10_000_000:07d}",
+            'first_name': f"User {user_id}",
+            'user_id': user_id
+        })),
+        ('jshir', factory.message(user_id, text=f"{user_id:014d}")),
+        ('tasks', factory.message(user_id, text=MAIN_MENU_TASKS)),
+        ('task_view', factory.callback(user_id, pack(Action.TASK_VIEW, task_id))),
+        ('task_complete', factory.callback(user_id, pack(Action.TASK_COMPLETE, task_id))),
+        ('upload', factory.message(user_id, document={
+            'file_id': f"doc{user_id}",
+            'file_unique_id': f"doc{user_id}",
+            'file_name': "hisobot.pdf",
+            'mime_type': 'application/pdf'
+        }))
+    ]
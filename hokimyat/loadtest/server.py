@@ -0,0 +1,47 @@
+import asyncio
+import random
+from typing import NamedTuple, Optional
+from aiohttp import web
+
+class Faults(NamedTuple):
+    """Latency and error injection for a fake server
+
+    Every request waits ``latency`` seconds plus up to ``jitter`` more and
+    fails with probability ``error_rate``.
+    """
+    latency: float = 0.0
+    jitter: float = 0.0
+    error_rate: float = 0.0
+
+    async def delay(self):
+        wait = self.latency + (random.uniform(0, self.jitter) if self.jitter else 0)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def should_fail(self) -> bool:
+        return self.error_rate > 0 and random.random() < self.error_rate
+
+class FakeServer:
+    """Base for fake HTTP servers running inside the load test process"""
+    def __init__(self, faults: Faults = Faults()):
+        self.faults = faults
+        self.url = ''
+        self._runner: Optional[web.AppRunner] = None
+
+    def make_app(self) -> web.Application:
+        raise NotImplementedError
+
+    async def start(self, host: str = '127.0.0.1', port: int = 0) -> str:
+        """Start serving, port 0 picks a free one; returns the base URL"""
+        self._runner = web.AppRunner(self.make_app(), access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        bound_port = self._runner.addresses[0][1]
+        self.url = f"http://{host}:{bound_port}"
+        return self.url
+
+    async def stop(self):
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
@@ -0,0 +1,8 @@
+from aiogram import BaseMiddleware
+from utils.lifecycle import lifecycle
+
+class InFlightMiddleware(BaseMiddleware):
+    """Track each update until its handler returns, so shutdown can drain it"""
+    async def __call__(self, handler, event, data):
+        with lifecycle.track():
+            return await handler(event, data)
@@ -0,0 +1,30 @@
+
+import logging
+import time
+from aiogram import BaseMiddleware
+from utils.logger import log_context, setup_logger
+
+logger = setup_logger(__name__)
+
+class LogContextMiddleware(BaseMiddleware):
+    """Attach user, handler and task to every log record of an update"""
+    async def __call__(self, handler, event, data):
+        callback_handler = data.get('callback_handler')
+        handler_object = data.get('handler')
+        target = callback_handler or (handler_object.callback if handler_object else None)
+        payload = data.get('callback_payload')
+        user = getattr(event, 'from_user', None)
+
+        token = log_context.set({
+            'user_id': user.id if user else None,
+            'handler': getattr(target, '__name__', None),
+            'task_id': payload.task_id if payload and payload.task_id else None
+        })
+        start = time.perf_counter()
+        try:
+            return await handler(event, data)
+        finally:
+            if logger.isEnabledFor(logging.DEBUG):
+                latency = round((time.perf_counter() - start) * 1000, 2)
+                logger.debug("Update handled in %s ms", latency, extra={'latency': latency})
+            log_context.reset(token)
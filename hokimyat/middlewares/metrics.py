@@ -0,0 +1,32 @@
+
+import time
+from aiogram import BaseMiddleware
+from aiogram.client.session.middlewares.base import BaseRequestMiddleware
+from aiogram.exceptions import TelegramRetryAfter
+from utils.metrics import HANDLER_LATENCY, TELEGRAM_REQUESTS, TELEGRAM_RETRY_AFTER
+
+class HandlerMetricsMiddleware(BaseMiddleware):
+    """Record handler latency per router and handler"""
+    async def __call__(self, handler, event, data):
+        start = time.perf_counter()
+        try:
+            return await handler(event, data)
+        finally:
+            router = data.get('event_router')
+            target = data.get('callback_handler') or data['handler'].callback
+            HANDLER_LATENCY.observe(
+                time.perf_counter() - start,
+                router=router.name if router else '',
+                handler=getattr(target, '__name__', '')
+            )
+
+class TelegramMetricsMiddleware(BaseRequestMiddleware):
+    """Count outgoing Bot API calls and 429 responses"""
+    async def __call__(self, make_request, bot, method):
+        method_name = type(method).__name__
+        TELEGRAM_REQUESTS.inc(method=method_name)
+        try:
+            return await make_request(bot, method)
+        except TelegramRetryAfter:
+            TELEGRAM_RETRY_AFTER.inc(method=method_name)
+            raise
@@ -2,10 +2,11 @@
 from aiogram import BaseMiddleware
 from aiogram.types import Message
 from cachetools import TTLCache
+from config import settings
 
 class ThrottlingMiddleware(BaseMiddleware):
-    def __init__(self, rate_limit=0.5):
-        self.cache = TTLCache(maxsize=10000, ttl=rate_limit)
+    def __init__(self, rate_limit: float = settings.throttle_rate):
+        self.cache = TTLCache(maxsize=settings.throttle_cache_size, ttl=rate_limit)
 
     async def __call__(self, handler, event: Message, data):
         if event.from_user.id in self.cache:
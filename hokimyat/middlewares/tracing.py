@@ -0,0 +1,35 @@
+
+from aiogram import BaseMiddleware
+from aiogram.client.session.middlewares.base import BaseRequestMiddleware
+from aiogram.types import Update
+from utils.tracing import export_if_slow, span, start_trace
+
+class TracingMiddleware(BaseMiddleware):
+    """Outer update middleware: one trace per update, slow ones are exported"""
+    async def __call__(self, handler, event: Update, data):
+        root = start_trace(
+            'update',
+            **{'update.id': event.update_id, 'update.type': event.event_type}
+        )
+        try:
+            with root:
+                return await handler(event, data)
+        finally:
+            await export_if_slow(root.trace)
+
+class HandlerSpanMiddleware(BaseMiddleware):
+    """Inner middleware: span around the resolved handler"""
+    async def __call__(self, handler, event, data):
+        target = data.get('callback_handler') or data['handler'].callback
+        user = getattr(event, 'from_user', None)
+        with span(
+            'handler',
+            **{'handler.name': getattr(target, '__name__', ''), 'user.id': user.id if user else 0}
+        ):
+            return await handler(event, data)
+
+class TracingRequestMiddleware(BaseRequestMiddleware):
+    """Span around every outgoing Bot API call"""
+    async def __call__(self, make_request, bot, method):
+        with span(f'telegram.{type(method).__name__}'):
+            return await make_request(bot, method)
@@ -0,0 +1,137 @@
+import sys
+from datetime import date
+from typing import Any, Dict, Optional, Tuple
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    # Statuses repeat across every task, share one string per value
+    return sys.intern(value) if value else value
+
+def parse_deadline(value: Optional[str]) -> Optional[date]:
+    """Date part of an ISO datetime such as ``2024-03-01T18:00:00``"""
+    if not value:
+        return None
+    try:
+        return date.fromisoformat(value[:10])
+    except ValueError:
+        return None
+
+class TaskFile:
+    """File attached to a task"""
+    __slots__ = ('name', 'file_url', 'file_type')
+
+    def __init__(self, name: str, file_url: str, file_type: str):
+        self.name = name
+        self.file_url = file_url
+        self.file_type = file_type
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'TaskFile':
+        return cls(
+            data.get('name') or 'Fayl',
+            data.get('file_url') or '',
+            _intern((data.get('file_type') or '').lower())
+        )
+
+class Task:
+    """Task as returned by the task list and task detail endpoints
+
+    The list endpoint omits some fields; they are left at their defaults.
+    ``deadline_text`` is the deadline formatted once for rendering.
+    """
+    __slots__ = (
+        'id', 'title', 'description', 'creator_name', 'deadline', 'deadline_text', 'status',
+        'status_display', 'percentage_count', 'rejection_reason', 'is_admin', 'files'
+    )
+
+    def __init__(
+        self,
+        id: int,
+        title: Optional[str] = None,
+        description: Optional[str] = None,
+        creator_name: Optional[str] = None,
+        deadline: Optional[date] = None,
+        status: Optional[str] = None,
+        status_display: Optional[str] = None,
+        percentage_count: int = 0,
+        rejection_reason: Optional[str] = None,
+        is_admin: bool = False,
+        files: Tuple[TaskFile, ...] = ()
+    ):
+        self.id = id
+        self.title = title
+        self.description = description
+        self.creator_name = creator_name
+        self.deadline = deadline
+        self.deadline_text = deadline.isoformat() if deadline else ''
+        self.status = status
+        self.status_display = status_display
+        self.percentage_count = percentage_count
+        self.rejection_reason = rejection_reason
+        self.is_admin = is_admin
+        self.files = files
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Task':
+        return cls(
+            data.get('id'),
+            data.get('title'),
+            data.get('description'),
+            data.get('creator_name'),
+            parse_deadline(data.get('deadline')),
+            _intern(data.get('status')),
+            _intern(data.get('status_display')),
+            data.get('percentage_count') or 0,
+            data.get('rejection_reason'),
+            bool(data.get('is_admin')),
+            tuple(TaskFile.from_dict(file) for file in data.get('files') or ())
+        )
+
+    def __repr__(self) -> str:
+        return f"Task(id={self.id!r}, status={self.status!r})"
+
+class TaskStats:
+    """Assignee counts per status for one task"""
+    __slots__ = ('completed', 'in_progress', 'pending', 'failed')
+
+    def __init__(self, completed: int = 0, in_progress: int = 0, pending: int = 0, failed: int = 0):
+        self.completed = completed
+        self.in_progress = in_progress
+        self.pending = pending
+        self.failed = failed
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'TaskStats':
+        return cls(
+            data.get('completed', 0),
+            data.get('in_progress', 0),
+            data.get('pending', 0),
+            data.get('failed', 0)
+        )
+
+class UserInfo:
+    """Registered bot user"""
+    __slots__ = ('telegram_id', 'full_name', 'job_title_name', 'mahalla_name', 'tuman_name')
+
+    def __init__(
+        self,
+        telegram_id: Optional[int] = None,
+        full_name: Optional[str] = None,
+        job_title_name: Optional[str] = None,
+        mahalla_name: Optional[str] = None,
+        tuman_name: Optional[str] = None
+    ):
+        self.telegram_id = telegram_id
+        self.full_name = full_name
+        self.job_title_name = job_title_name
+        self.mahalla_name = mahalla_name
+        self.tuman_name = tuman_name
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'UserInfo':
+        return cls(
+            data.get('telegram_id'),
+            data.get('full_name'),
+            _intern(data.get('job_title_name')),
+            _intern(data.get('mahalla_name')),
+            _intern(data.get('tuman_name'))
+        )
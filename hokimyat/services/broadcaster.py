@@ -1,26 +1,78 @@
+import time
+from collections import Counter
+from typing import NamedTuple
 from aiogram import Bot
 from database import SessionLocal
 from models.base import User
+from utils.lifecycle import lifecycle
 from utils.logger import setup_logger
+from utils.metrics import BROADCAST_MESSAGES, BROADCAST_DURATION
+from config import settings
 
 logger = setup_logger(__name__)
 
-async def broadcast_message(bot: Bot, message: str) -> tuple[int, int]:
+class BroadcastResult(NamedTuple):
+    successful: int
+    failed: int
+    # Set when shutdown stopped the broadcast before every user was reached
+    interrupted: bool = False
+    # Id of the last user handled; pass as ``start_after`` to resume
+    checkpoint: int = 0
+
+async def broadcast_message(bot: Bot, message: str, start_after: int = 0) -> BroadcastResult:
+    """Send ``message`` to every user with an id above ``start_after``
+
+    Users go in id order. When the bot shuts down the broadcast stops
+    between two sends and returns with ``interrupted`` set; its
+    ``checkpoint`` is the ``start_after`` that resumes it.
+    """
     successful, failed = 0, 0
+    interrupted = False
+    errors = Counter()
+    checkpoint = start_after
     db = SessionLocal()
+    start = time.perf_counter()
     
     try:
-        users = db.query(User).all()
-        for user in users:
+        users = db.query(User).filter(User.id > start_after).order_by(User.id).all()
+        total = len(users)
+        for sent, user in enumerate(users, 1):
+            if lifecycle.stopping:
+                logger.warning(
+                    "Broadcast stopped by shutdown at %s/%s: %s sent, %s failed, errors: %s; "
+                    "resume after user id %s",
+                    sent - 1, total, successful, failed, dict(errors), checkpoint,
+                    extra={'status': 'interrupted'}
+                )
+                interrupted = True
+                break
             try:
                 await bot.send_message(user.telegram_id, message)
                 successful += 1
-                logger.info(f"Message sent to {user.telegram_id}")
+                BROADCAST_MESSAGES.inc(result='sent')
             except Exception as e:
                 failed += 1
-                logger.error(f"Failed to send message to {user.telegram_id}: {e}")
+                BROADCAST_MESSAGES.inc(result='failed')
+                errors[type(e).__name__] += 1
+                # Only a sample of failures is logged one by one
+                if failed <= settings.broadcast_log_sample:
+                    logger.warning(
+                        "Failed to send message to %s: %s",
+                        user.telegram_id, e,
+                        extra={'user_id': user.telegram_id}
+                    )
+            
+            checkpoint = user.id
+            if sent % settings.broadcast_log_every == 0:
+                logger.info("Broadcast progress: %s/%s, failed: %s", sent, total, failed)
     finally:
         db.close()
+        BROADCAST_DURATION.observe(time.perf_counter() - start)
     
-    return successful, failed
-
+    if not interrupted:
+        logger.info(
+            "Broadcast finished: %s sent, %s failed, errors: %s",
+            successful, failed, dict(errors),
+            extra={'status': 'done'}
+        )
+    return BroadcastResult(successful, failed, interrupted, checkpoint)
@@ -1,14 +1,17 @@
-import pandas as pd
 from io import BytesIO
 from sqlalchemy import create_engine, text
 from utils.logger import setup_logger
-from config import DATABASE_URL
+from config import settings
 
 logger = setup_logger(__name__)
 
 def generate_users_excel() -> BytesIO:
+    # pandas (and openpyxl, which it loads for the writer) costs hundreds of
+    # milliseconds on import; only the admin export needs them
+    import pandas as pd
+
     try:
-        engine = create_engine(DATABASE_URL)
+        engine = create_engine(settings.database_url)
         
         query = text("""
             SELECT 
@@ -65,7 +68,7 @@ def generate_users_excel() -> BytesIO:
         return buffer
         
     except Exception as e:
-        logger.error(f"Excel fayl yaratishda xatolik: {e}")
+        logger.error("Excel fayl yaratishda xatolik: %s", e)
         raise
     finally:
         if 'engine' in locals():
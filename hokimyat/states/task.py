@@ -3,6 +3,7 @@ from aiogram.fsm.state import StatesGroup, State
 class TaskState(StatesGroup):
     description = State()
     files = State()
+    report_files = State()
 
 class AdminTaskState(StatesGroup):
     rejection_reason = State()
\ No newline at end of file
@@ -0,0 +1,83 @@
+import pytest
+from utils import api
+from loadtest.fake_backend import make_task
+from utils.api import APIResponse, api_client, cache, cached
+
+class Client:
+    def __init__(self):
+        self.calls = 0
+
+    @cached(ttl=60)
+    async def get_task(self, task_id):
+        self.calls += 1
+        return APIResponse({'id': task_id}, 200)
+
+    @cached(ttl=60, key=lambda telegram_id: int(telegram_id))
+    async def get_user(self, telegram_id):
+        self.calls += 1
+        return APIResponse({'id': telegram_id}, 200)
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+@pytest.mark.asyncio
+async def test_key_ignores_instance():
+    first, second = Client(), Client()
+    await first.get_task(1)
+    await second.get_task(1)
+
+    assert (first.calls, second.calls) == (1, 0)
+    assert ('get_task', (1,)) in cache
+
+@pytest.mark.asyncio
+async def test_custom_key_and_invalidate():
+    client = Client()
+    await client.get_user(5)
+    await client.get_user("5")
+    assert client.calls == 1
+
+    client.get_user.invalidate(client, "5")
+    await client.get_user(5)
+    assert client.calls == 2
+
+@pytest.mark.asyncio
+async def test_entries_expire_after_ttl(monkeypatch):
+    client = Client()
+    now = 1000.0
+    monkeypatch.setattr(api.time, 'monotonic', lambda: now)
+    await client.get_task(1)
+
+    now += 59
+    await client.get_task(1)
+    assert client.calls == 1
+
+    # Older than a day: timedelta.seconds used to wrap around here
+    now += 86400
+    await client.get_task(1)
+    assert client.calls == 2
+
+@pytest.mark.asyncio
+async def test_admin_status_change_clears_owner_cache(monkeypatch):
+    owner, other, admin = 1, 2, 99
+    lists = {owner: [make_task(7), make_task(8)], other: [make_task(9)]}
+
+    async def backend(method, endpoint, data=None, params=None):
+        if method == 'PATCH':
+            return APIResponse({'status': 'success'}, 200)
+        if endpoint == 'tasks/':
+            return APIResponse({'status': 'success', 'tasks': lists[params['telegram_id']]}, 200)
+        return APIResponse({'status': 'success', 'task': make_task(7)}, 200)
+
+    monkeypatch.setattr(api_client, '_make_request', backend)
+    await api_client.get_user_tasks(owner)
+    await api_client.get_user_tasks(other)
+    await api_client.get_task_detail(7)
+
+    await api_client.update_task_status(7, 'completed', admin)
+
+    assert ('get_user_tasks', (owner,)) not in cache
+    assert ('get_task_detail', (7,)) not in cache
+    assert ('get_user_tasks', (other,)) in cache
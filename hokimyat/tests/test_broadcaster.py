@@ -0,0 +1,43 @@
+import importlib
+import logging
+from unittest.mock import AsyncMock
+import pytest
+import config
+
+@pytest.fixture
+def broadcaster(monkeypatch):
+    # The engine is created on first import, keep it off the production database
+    monkeypatch.setattr(config, 'settings', config.settings._replace(database_url='sqlite://'))
+    database = importlib.import_module('database')
+    from models.base import User
+
+    database.Base.metadata.create_all(database.engine)
+    db = database.SessionLocal()
+    db.query(User).delete()
+    db.add_all([User(id=i, telegram_id=1000 + i, phone_number=str(i)) for i in range(1, 6)])
+    db.commit()
+    db.close()
+    return importlib.import_module('services.broadcaster')
+
+@pytest.mark.asyncio
+async def test_shutdown_interrupts_broadcast_with_checkpoint(broadcaster, monkeypatch, caplog):
+    monkeypatch.setattr(broadcaster.lifecycle, 'stopping', False)
+    bot = AsyncMock()
+
+    async def send_message(chat_id, text):
+        if chat_id == 1002:
+            broadcaster.lifecycle.stopping = True
+
+    bot.send_message.side_effect = send_message
+    with caplog.at_level(logging.INFO, logger=broadcaster.logger.name):
+        result = await broadcaster.broadcast_message(bot, "Salom")
+
+    assert result == (2, 0, True, 2)
+    assert "stopped by shutdown" in caplog.text
+    assert "Broadcast finished" not in caplog.text
+
+    monkeypatch.setattr(broadcaster.lifecycle, 'stopping', False)
+    bot.send_message.side_effect = None
+    result = await broadcaster.broadcast_message(bot, "Salom", start_after=result.checkpoint)
+    assert result == (3, 0, False, 5)
+    assert [call.args[0] for call in bot.send_message.await_args_list[2:]] == [1003, 1004, 1005]
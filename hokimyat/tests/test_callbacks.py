@@ -0,0 +1,29 @@
+
+import pytest
+from utils.callbacks import Action, CallbackPayload, CallbackTable, pack, unpack, status_code
+
+def test_pack_roundtrip():
+    data = pack(Action.TASK_MARK, 4294967295, page=65535, value=status_code('failed'))
+    payload = unpack(data)
+    assert payload == CallbackPayload(Action.TASK_MARK, 4294967295, 65535, 3)
+    assert payload.status == 'failed'
+    assert len(data.encode()) <= 64
+
+@pytest.mark.parametrize("data", ["", "task_view_12", "cancel_admin", "#not-base64!", pack(Action.NOOP)[:-1]])
+def test_unpack_rejects_foreign_data(data):
+    assert unpack(data) is None
+
+def test_table_resolves_registered_action():
+    table = CallbackTable()
+
+    @table.register(Action.TASK_VIEW)
+    async def view(callback, state, payload):
+        pass
+
+    handler, payload = table.resolve(pack(Action.TASK_VIEW, 42))
+    assert handler is view
+    assert payload.task_id == 42
+    assert table.resolve(pack(Action.TASK_STATS, 42)) is None
+
+    with pytest.raises(ValueError):
+        table.register(Action.TASK_VIEW)(view)
@@ -0,0 +1,17 @@
+import pytest
+from utils.codec import CODECS, get_codec
+
+PAYLOAD = {'status': 'success', 'tasks': [{'id': 1, 'title': "Hisobot ✅", 'files': []}]}
+
+@pytest.mark.parametrize("name", sorted(CODECS))
+def test_codecs_roundtrip_and_reject_malformed(name):
+    codec = CODECS[name]
+    body = codec.dumps(PAYLOAD)
+    assert isinstance(body, bytes)
+    assert codec.loads(body) == PAYLOAD
+    assert codec.loads(body.decode('utf-8')) == PAYLOAD
+    with pytest.raises(ValueError):
+        codec.loads(b'{"status": ')
+
+def test_unknown_codec_falls_back_to_available():
+    assert get_codec('missing').name in CODECS
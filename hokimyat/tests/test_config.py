@@ -0,0 +1,44 @@
+import pytest
+from config import SettingsError, load_settings
+
+def test_environment_overrides_profile_and_defaults():
+    settings = load_settings({
+        'BOT_ENV': 'development',
+        'API_POOL_SIZE': '250',
+        'API_TIMEOUT': '12.5',
+        'ADMIN_IDS': '1, 2,3',
+        'TRACING_ENABLED': 'no'
+    })
+    assert settings.database_url == 'sqlite:///bot.db'
+    assert settings.log_level == 'DEBUG'
+    assert settings.api_pool_size == 250
+    assert settings.api_timeout == 12.5
+    assert settings.admin_ids == (1, 2, 3)
+    assert settings.tracing_enabled is False
+    assert settings.cache_ttl == 60
+
+def test_every_problem_is_reported():
+    with pytest.raises(SettingsError) as error:
+        load_settings({'API_POOL_SIZE': 'many', 'METRICS_ENABLED': 'maybe'})
+    assert 'API_POOL_SIZE' in str(error.value) and 'METRICS_ENABLED' in str(error.value)
+
+    with pytest.raises(SettingsError) as error:
+        load_settings({'API_TIMEOUT': '1', 'API_TIMEOUT_MIN': '5', 'EXECUTOR_WORKERS': '0'})
+    assert 'API_TIMEOUT_MIN' in str(error.value) and 'EXECUTOR_WORKERS' in str(error.value)
+
+def test_production_needs_deployment_settings():
+    with pytest.raises(SettingsError) as error:
+        load_settings({})
+    for name in ('DATABASE_URL', 'API_URL', 'ADMIN_IDS'):
+        assert f"{name} is required" in str(error.value)
+
+    settings = load_settings({
+        'DATABASE_URL': 'postgresql://bot@db/bot',
+        'API_URL': 'https://api.example.com',
+        'ADMIN_IDS': '7'
+    })
+    assert settings.bot_env == 'production' and settings.admin_ids == (7,)
+
+def test_unknown_profile_is_rejected():
+    with pytest.raises(SettingsError):
+        load_settings({'BOT_ENV': 'staging'})
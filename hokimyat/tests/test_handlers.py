@@ -1,10 +1,115 @@
-
+from datetime import datetime
+from unittest.mock import AsyncMock, patch
 import pytest
-from aiogram.types import Message
+from aiogram.fsm.context import FSMContext
+from aiogram.fsm.storage.base import StorageKey
+from aiogram.fsm.storage.memory import MemoryStorage
+from aiogram.types import CallbackQuery, Chat, Document, Message, User
+from handlers import task as task_handlers
+from handlers.task import (
+    cmd_tasks, mark_task, process_report_description, process_report_files, start_task_report
+)
 from handlers.user import cmd_start
+from states.task import TaskState
+from utils.callbacks import Action, CallbackPayload
+from loadtest.fake_backend import make_task
+from models.api import Task, UserInfo
+from utils.api import APIResponse
+
+def make_message(text: str = None, **fields) -> Message:
+    return Message(
+        message_id=1,
+        date=datetime.now(),
+        chat=Chat(id=1, type='private'),
+        from_user=User(id=1, is_bot=False, first_name="Test"),
+        text=text,
+        **fields
+    )
+
+def make_state() -> FSMContext:
+    return FSMContext(MemoryStorage(), StorageKey(bot_id=42, chat_id=1, user_id=1))
 
 @pytest.mark.asyncio
 async def test_cmd_start():
-    message = Message(text="/start")
-    result = await cmd_start(message)
-    assert "Welcome" in result.text
+    response = APIResponse({'status': 'success'}, 200, result=UserInfo(full_name="Test User"))
+    state = AsyncMock()
+
+    with patch('handlers.user.get_user_info', AsyncMock(return_value=response)), \
+            patch.object(Message, 'answer', AsyncMock()) as answer:
+        await cmd_start(make_message("/start"), state)
+
+    assert "Xush kelibsiz, Test User!" in answer.call_args.args[0]
+    state.set_state.assert_not_called()
+
+@pytest.mark.asyncio
+async def test_task_report_collects_description_and_files():
+    state = make_state()
+    callback = CallbackQuery(
+        id="1", from_user=User(id=1, is_bot=False, first_name="Test"),
+        chat_instance="1", message=make_message("task")
+    )
+    response = APIResponse({'status': 'success'}, 200)
+    document = Document(file_id="doc-1", file_unique_id="u1", file_name="report.pdf")
+
+    with patch('handlers.task.submit_task_progress', AsyncMock(return_value=response)) as submit, \
+            patch('handlers.task.get_task_detail', AsyncMock(return_value=APIResponse({}, 404))), \
+            patch.object(Message, 'answer', AsyncMock()), \
+            patch.object(CallbackQuery, 'answer', AsyncMock()):
+        await start_task_report(callback, state, CallbackPayload(Action.TASK_PROGRESS, 7))
+        assert await state.get_state() == TaskState.description
+
+        await process_report_description(make_message("Yarmi bajarildi"), state)
+        await process_report_files(make_message(document=document), state)
+        submit.assert_not_called()
+
+        await process_report_files(make_message("✅ Yuborishni yakunlash"), state)
+
+    submit.assert_awaited_once_with(
+        7, 1, "Yarmi bajarildi", [{"file_id": "doc-1", "name": "report.pdf"}]
+    )
+    assert await state.get_state() is None
+
+@pytest.mark.asyncio
+async def test_cmd_tasks_lists_tasks_for_admins(monkeypatch):
+    monkeypatch.setattr(task_handlers, 'settings', task_handlers.settings._replace(admin_ids=(1,)))
+    tasks = [Task.from_dict(make_task(task_id)) for task_id in (3, 4)]
+    response = APIResponse({'status': 'success'}, 200, result=tasks)
+
+    with patch('handlers.task.get_user_tasks', AsyncMock(return_value=response)) as get_tasks, \
+            patch.object(Message, 'answer', AsyncMock()) as answer:
+        await cmd_tasks(make_message("/tasks"))
+
+    get_tasks.assert_awaited_once_with(1)
+    assert answer.call_args.args[0] == "Mavjud topshiriqlar:"
+    rows = answer.call_args.kwargs['reply_markup'].inline_keyboard
+    assert [row[0].text for row in rows] == [
+        f"{task_handlers.STATUS_EMOJI[task.status]} {task.title}" for task in tasks
+    ]
+
+@pytest.mark.asyncio
+async def test_cmd_tasks_refuses_other_users(monkeypatch):
+    monkeypatch.setattr(task_handlers, 'settings', task_handlers.settings._replace(admin_ids=(2,)))
+
+    with patch('handlers.task.get_user_tasks', AsyncMock()) as get_tasks, \
+            patch.object(Message, 'answer', AsyncMock()) as answer:
+        await cmd_tasks(make_message("/tasks"))
+
+    get_tasks.assert_not_called()
+    assert answer.call_args.args[0] == "Bu buyruq faqat adminlar uchun."
+
+@pytest.mark.asyncio
+async def test_mark_task_reports_backend_error_status(monkeypatch):
+    monkeypatch.setattr(task_handlers, 'settings', task_handlers.settings._replace(admin_ids=(1,)))
+    callback = CallbackQuery(
+        id="1", from_user=User(id=1, is_bot=False, first_name="Test"),
+        chat_instance="1", message=make_message("tasks")
+    )
+    response = APIResponse({'status': 'error', 'message': "Ruxsat yo'q"}, 200)
+
+    with patch('handlers.task.update_task_status', AsyncMock(return_value=response)), \
+            patch('handlers.task.get_user_tasks', AsyncMock()) as get_tasks, \
+            patch.object(CallbackQuery, 'answer', AsyncMock()) as answer:
+        await mark_task(callback, make_state(), CallbackPayload(Action.TASK_MARK, 7, value=2))
+
+    assert answer.call_args.args[0] == "Xatolik yuz berdi. Qaytadan urinib ko'ring."
+    get_tasks.assert_not_called()
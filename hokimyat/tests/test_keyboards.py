@@ -0,0 +1,26 @@
+import json
+import pytest
+from pydantic import ValidationError
+from aiogram import Bot
+from aiogram.client.session.aiohttp import AiohttpSession
+from keyboards.inline import get_task_detail_keyboard
+from keyboards.reply import get_main_menu
+from utils.callbacks import Action, pack
+
+def test_shared_keyboards_are_immutable():
+    menu = get_main_menu()
+    with pytest.raises(ValidationError):
+        menu.resize_keyboard = False
+    with pytest.raises(AttributeError):
+        menu.keyboard.append([])
+
+    detail = get_task_detail_keyboard(7, 'pending')
+    with pytest.raises(ValidationError):
+        detail.inline_keyboard[0][0].text = "changed"
+    assert get_task_detail_keyboard(7, 'pending') is detail
+
+def test_frozen_keyboard_serializes_like_plain_markup():
+    session = AiohttpSession()
+    bot = Bot("42:TEST", session=session)
+    data = json.loads(session.prepare_value(get_task_detail_keyboard(7, 'completed'), bot=bot, files={}))
+    assert data['inline_keyboard'][0] == [{"text": "📊 Statistika", "callback_data": pack(Action.TASK_STATS, 7)}]
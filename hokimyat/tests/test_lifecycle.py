@@ -0,0 +1,41 @@
+import asyncio
+from utils.lifecycle import Lifecycle
+
+def test_drain_waits_for_in_flight_work_then_cancels_the_rest():
+    lifecycle = Lifecycle()
+    finished = []
+
+    async def work(seconds: float):
+        with lifecycle.track():
+            await asyncio.sleep(seconds)
+            finished.append(seconds)
+
+    async def scenario():
+        asyncio.create_task(work(0.01))
+        slow = asyncio.create_task(work(10))
+        await asyncio.sleep(0)
+        assert lifecycle.in_flight == 2
+        cancelled = await lifecycle.drain(timeout=0.2)
+        return cancelled, slow.cancelled()
+
+    assert asyncio.run(scenario()) == (1, True)
+    assert finished == [0.01]
+    assert lifecycle.stopping and lifecycle.in_flight == 0
+
+def test_resources_close_in_order_despite_failures():
+    lifecycle = Lifecycle()
+    closed = []
+
+    async def close_api():
+        closed.append('api')
+
+    def close_broken():
+        raise RuntimeError("already closed")
+
+    lifecycle.add_resource('api', close=close_api)
+    lifecycle.add_resource('broken', warm=close_broken, close=close_broken)
+    lifecycle.add_resource('database', close=lambda: closed.append('database'))
+
+    asyncio.run(lifecycle.warm())
+    asyncio.run(lifecycle.close())
+    assert closed == ['api', 'database']
@@ -0,0 +1,11 @@
+import pytest
+from loadtest.runner import Options, run
+
+@pytest.mark.asyncio
+async def test_users_complete_journey_without_errors():
+    report = await run(Options(users=5, concurrency=5, tasks=3))
+
+    assert report.updates == 5 * 7
+    assert report.failed_updates == 0
+    assert report.error_replies == 0
+    assert report.updates_per_second > 0
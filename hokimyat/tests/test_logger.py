@@ -0,0 +1,57 @@
+
+import json
+import logging
+from logging.handlers import QueueHandler
+import pytest
+import utils.logger
+from utils.logger import setup_logger, shutdown_logging
+
+@pytest.fixture
+def log_file(tmp_path, monkeypatch):
+    """Fresh logging setup writing to a temporary file"""
+    def reset():
+        shutdown_logging()
+        root = logging.getLogger()
+        for handler in [h for h in root.handlers if isinstance(h, QueueHandler)]:
+            root.removeHandler(handler)
+
+    reset()
+    path = tmp_path / 'bot.log'
+    settings = utils.logger.settings._replace(log_file=str(path))
+    monkeypatch.setattr(utils.logger, 'settings', settings)
+    yield path
+    reset()
+
+def test_setup_logger_is_idempotent(log_file):
+    setup_logger('first')
+    setup_logger('second')
+    setup_logger('first')
+
+    root = logging.getLogger()
+    assert sum(isinstance(h, QueueHandler) for h in root.handlers) == 1
+    assert not logging.getLogger('first').handlers
+
+def test_records_are_written_once(log_file):
+    setup_logger('first').warning("queued record")
+    setup_logger('first').info("second record")
+    shutdown_logging()
+
+    content = log_file.read_text(encoding='utf-8')
+    assert content.count("queued record") == 1
+    assert content.count("second record") == 1
+
+def test_json_lines_carry_context(log_file, monkeypatch):
+    settings = utils.logger.settings._replace(log_json=True)
+    monkeypatch.setattr(utils.logger, 'settings', settings)
+    token = utils.logger.log_context.set({'user_id': 7, 'handler': 'show_tasks'})
+    try:
+        setup_logger('json').info("Task %s opened", 12, extra={'task_id': 12})
+    finally:
+        utils.logger.log_context.reset(token)
+    shutdown_logging()
+
+    entry = json.loads(log_file.read_text(encoding='utf-8').splitlines()[0])
+    assert entry['message'] == "Task 12 opened"
+    assert entry['user_id'] == 7
+    assert entry['handler'] == 'show_tasks'
+    assert entry['task_id'] == 12
@@ -0,0 +1,33 @@
+
+import pytest
+from utils.metrics import Counter, Histogram, Registry, endpoint_label
+import utils.metrics
+
+@pytest.fixture(autouse=True)
+def registry(monkeypatch):
+    registry = Registry()
+    monkeypatch.setattr(utils.metrics, 'REGISTRY', registry)
+    return registry
+
+def test_counter_exposition(registry):
+    requests = Counter('test_requests_total', "Requests", ('method',))
+    requests.inc(method='sendMessage')
+    requests.inc(2, method='sendMessage')
+
+    text = registry.render()
+    assert "# TYPE test_requests_total counter" in text
+    assert 'test_requests_total{method="sendMessage"} 3' in text
+
+def test_histogram_buckets_are_cumulative(registry):
+    latency = Histogram('test_latency_seconds', "Latency", ('handler',), buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 5.0):
+        latency.observe(value, handler='show_tasks')
+
+    text = registry.render()
+    assert 'test_latency_seconds_bucket{handler="show_tasks",le="0.1"} 1' in text
+    assert 'test_latency_seconds_bucket{handler="show_tasks",le="1.0"} 2' in text
+    assert 'test_latency_seconds_bucket{handler="show_tasks",le="+Inf"} 3' in text
+    assert 'test_latency_seconds_count{handler="show_tasks"} 3' in text
+
+def test_endpoint_label_collapses_ids():
+    assert endpoint_label('tasks/123/stats/') == 'tasks/{id}/stats'
@@ -0,0 +1,53 @@
+from datetime import date
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from models.api import Task, TaskStats
+from utils.api import APIClient, APIResponse, api_client, parse_response
+
+def test_task_list_parsed_once_at_boundary():
+    payload = {
+        'status': 'success',
+        'tasks': [
+            {'id': 1, 'title': "Hisobot", 'status': 'in_progress', 'deadline': '2024-03-01T18:00:00',
+             'files': [{'name': 'a.pdf', 'file_url': 'https://example.com/a.pdf', 'file_type': 'PDF'}]},
+            {'id': 2, 'status': ''.join(['in_', 'progress']), 'deadline': 'soon'}
+        ]
+    }
+    response = parse_response(APIResponse(payload, 200), 'tasks', Task)
+
+    first, second = response.result
+    assert response.ok and 'tasks' not in response.data
+    assert first.deadline == date(2024, 3, 1) and second.deadline is None
+    assert first.status is second.status
+    assert first.files[0].file_type == 'pdf'
+
+def test_failed_response_keeps_payload():
+    response = parse_response(APIResponse({'status': 'error', 'message': "Topilmadi"}, 404), 'stats', TaskStats)
+    assert not response.ok
+    assert response.result is None
+    assert response.message == "Topilmadi"
+
+@pytest.mark.parametrize("status_code", [200, 204])
+def test_empty_body_is_not_ok(status_code):
+    response = parse_response(APIResponse(None, status_code), 'task', Task)
+    assert response.success and not response.ok
+    assert response.result is None
+    assert response.message == ""
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("status_code", [200, 204])
+async def test_empty_body_is_not_a_format_error(monkeypatch, status_code):
+    async def empty(request):
+        return web.Response(status=status_code)
+
+    app = web.Application()
+    app.router.add_get('/api/tasks/', empty)
+    async with TestServer(app) as server:
+        monkeypatch.setattr(api_client, 'base_url', str(server.make_url('')).rstrip('/'))
+        try:
+            response = await api_client._make_request('GET', 'tasks/')
+        finally:
+            await APIClient.close()
+    assert response.status_code == status_code
+    assert response.data is None and not response.ok
@@ -0,0 +1,120 @@
+import pytest
+from utils import api
+from utils.api import APIError, APIResponse, CircuitOpenError, api_client, cache, cached
+from utils.resilience import OPEN, CircuitBreaker, LatencyTracker, RetryBudget
+
+def test_breaker_opens_and_probes_after_reset(monkeypatch):
+    now = 100.0
+    monkeypatch.setattr(api.time, 'monotonic', lambda: now)
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30)
+
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == OPEN and not breaker.allow()
+
+    now += 30
+    assert breaker.allow()
+    assert not breaker.allow()  # one probe at a time
+    breaker.record_success()
+    assert breaker.allow()
+
+def test_timeout_follows_latency_percentile():
+    tracker = LatencyTracker(floor=0.5, ceiling=30, multiplier=3, min_samples=20)
+    assert tracker.timeout() == 30
+    for _ in range(20):
+        tracker.observe(0.4)
+    assert tracker.timeout() == pytest.approx(1.2)
+    for _ in range(200):
+        tracker.observe(0.01)
+    assert tracker.timeout() == 0.5
+
+def test_timeouts_raise_timeout_from_floor():
+    tracker = LatencyTracker(floor=1, ceiling=30, multiplier=3, min_samples=20)
+    for _ in range(200):
+        tracker.observe(0.05)
+    assert tracker.timeout() == 1
+
+    timeouts = []
+    for _ in range(6):
+        tracker.observe_timeout(tracker.timeout())
+        timeouts.append(tracker.timeout())
+    assert timeouts == [2, 4, 8, 16, 30, 30]
+
+    # The recorded timeouts now set the percentile, it doesn't fall back to the floor
+    for _ in range(10):
+        tracker.observe(0.05)
+    assert tracker.timeout() == 8 * 3
+
+def test_retry_budget_is_fraction_of_requests():
+    budget = RetryBudget(ratio=0.25, burst=2)
+    assert budget.withdraw() and budget.withdraw()
+    assert not budget.withdraw()
+    for _ in range(4):
+        budget.deposit()
+    assert budget.withdraw()
+    assert not budget.withdraw()
+
+@pytest.mark.asyncio
+async def test_open_circuit_fails_fast_without_request(monkeypatch):
+    sent = []
+
+    async def failing_send(method, endpoint, *args):
+        sent.append(endpoint)
+        raise APIError("Request timeout", 408)
+
+    monkeypatch.setattr(api_client, '_send', failing_send)
+    monkeypatch.setattr(api_client, 'breakers', {'tasks': CircuitBreaker(failure_threshold=2)})
+    monkeypatch.setattr(api_client, 'retry_budget', RetryBudget(burst=10))
+    monkeypatch.setattr(api, 'retry_delay', lambda attempt: 0)
+
+    with pytest.raises(APIError):
+        await api_client._make_request('GET', 'tasks/')
+    assert len(sent) == 2
+
+    with pytest.raises(CircuitOpenError):
+        await api_client._make_request('GET', 'tasks/')
+    assert len(sent) == 2
+
+@pytest.mark.asyncio
+async def test_stale_response_served_when_backend_fails(monkeypatch):
+    now = 1000.0
+    monkeypatch.setattr(api.time, 'monotonic', lambda: now)
+    fresh = APIResponse({'status': 'success'}, 200)
+    responses = [fresh, CircuitOpenError('tasks')]
+
+    @cached(ttl=60)
+    async def get_tasks(telegram_id):
+        response = responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    cache.clear()
+    await get_tasks(1)
+    now += 120
+    assert await get_tasks(1) is fresh
+    cache.clear()
+
+@pytest.mark.asyncio
+async def test_attempts_share_one_deadline(monkeypatch):
+    now = 0.0
+    timeouts = []
+
+    async def slow_send(*args):
+        nonlocal now
+        timeouts.append(args[-1])
+        now += 4
+        raise APIError("Request timeout", 408)
+
+    monkeypatch.setattr(api.time, 'monotonic', lambda: now)
+    monkeypatch.setattr(api, 'settings', api.settings._replace(api_timeout=10, api_max_retries=5))
+    monkeypatch.setattr(api_client, '_send', slow_send)
+    monkeypatch.setattr(api_client, 'breakers', {})
+    monkeypatch.setattr(api_client, 'latencies', {})
+    monkeypatch.setattr(api_client, 'retry_budget', RetryBudget(burst=10))
+    monkeypatch.setattr(api, 'retry_delay', lambda attempt: 0)
+
+    with pytest.raises(APIError):
+        await api_client._make_request('GET', 'tasks/')
+    assert timeouts == [10, 6, 2]
@@ -0,0 +1,30 @@
+import subprocess
+import sys
+import pytest
+from handlers import load_routers
+from utils.startup import BOT_DIR, parse_importtime
+
+IMPORTTIME = """\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   _io
+import time:      2500 |       2620 | bot
+"""
+
+def test_parse_importtime():
+    timings = parse_importtime(IMPORTTIME)
+    assert [(timing.module, timing.self_us, timing.cumulative_us, timing.depth) for timing in timings] == [
+        ('_io', 120, 120, 1),
+        ('bot', 2500, 2620, 0),
+    ]
+
+def test_load_routers_in_order():
+    assert [router.name for router in load_routers(['task', 'user'])] == ['task', 'user']
+    with pytest.raises(ValueError):
+        load_routers(['missing'])
+
+def test_excel_export_imports_pandas_lazily():
+    result = subprocess.run(
+        [sys.executable, '-c', "import sys, services.excel; sys.exit('pandas' in sys.modules)"],
+        cwd=BOT_DIR
+    )
+    assert result.returncode == 0
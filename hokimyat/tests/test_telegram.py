@@ -0,0 +1,41 @@
+from unittest.mock import AsyncMock, MagicMock
+import pytest
+from aiogram.exceptions import TelegramBadRequest
+from aiogram.methods import EditMessageReplyMarkup
+from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup
+from utils.telegram import edit_markup, gather_calls
+
+class Method:
+    """Unhashable awaitable, like aiogram's TelegramMethod"""
+    __hash__ = None
+
+    def __init__(self, result):
+        self.result = result
+
+    def __await__(self):
+        return self._call().__await__()
+
+    async def _call(self):
+        return self.result
+
+async def coroutine():
+    return 'coroutine'
+
+@pytest.mark.asyncio
+async def test_gather_calls_accepts_unhashable_awaitables():
+    assert await gather_calls(Method(1), coroutine(), Method(2)) == [1, 'coroutine', 2]
+
+@pytest.mark.asyncio
+async def test_edit_markup_ignores_unchanged_keyboard():
+    markup = InlineKeyboardMarkup(inline_keyboard=[[InlineKeyboardButton(text="1/2", callback_data="x")]])
+    message = MagicMock(reply_markup=markup, edit_reply_markup=AsyncMock())
+    assert not await edit_markup(message, markup.model_copy(deep=True))
+    message.edit_reply_markup.assert_not_called()
+
+    error = TelegramBadRequest(EditMessageReplyMarkup(), "Bad Request: message is not modified")
+    message = MagicMock(reply_markup=None, edit_reply_markup=AsyncMock(side_effect=error))
+    assert not await edit_markup(message, markup)
+
+    message.edit_reply_markup.side_effect = TelegramBadRequest(EditMessageReplyMarkup(), "Bad Request: chat not found")
+    with pytest.raises(TelegramBadRequest):
+        await edit_markup(message, markup)
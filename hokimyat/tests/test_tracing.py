@@ -0,0 +1,33 @@
+
+import asyncio
+import json
+import utils.tracing
+from utils.tracing import export_if_slow, span, start_trace
+
+def test_spans_nest_under_update_trace(tmp_path, monkeypatch):
+    trace_file = tmp_path / 'traces.jsonl'
+    monkeypatch.setattr(
+        utils.tracing, 'settings',
+        utils.tracing.settings._replace(trace_file=str(trace_file), trace_slow_ms=0)
+    )
+
+    async def handle_update():
+        root = start_trace('update', **{'update.id': 1})
+        with root:
+            with span('api.request', **{'api.endpoint': 'tasks'}):
+                await asyncio.sleep(0)
+        await export_if_slow(root.trace)
+
+    asyncio.run(handle_update())
+
+    exported = json.loads(trace_file.read_text(encoding='utf-8'))
+    spans = exported['resourceSpans'][0]['scopeSpans'][0]['spans']
+    request, update = spans
+    assert update['name'] == 'update' and 'parentSpanId' not in update
+    assert request['parentSpanId'] == update['spanId']
+    assert request['traceId'] == update['traceId']
+
+def test_span_outside_trace_is_noop():
+    with span('api.request') as current:
+        current.set_attribute('http.status_code', 200)
+    assert not hasattr(current, 'trace')
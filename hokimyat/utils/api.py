@@ -1,96 +1,173 @@
 import aiohttp
 import asyncio
-from typing import Dict, Any, Tuple, List, Optional, Union
-from datetime import datetime
-import json
-import backoff
+import inspect
+import logging
+import time
+from typing import Callable, Dict, Any, Hashable, Tuple, List, Optional, Union
 from aiohttp import ClientTimeout, TCPConnector, ClientSession
 from functools import wraps
-import hashlib
 from contextlib import suppress
 import mimetypes
 import os
+import random
 from aiogram import Bot
-from config import (
-    API_URL,
-    API_TIMEOUT,
-    API_RETRY_COUNT,
-    API_RETRY_DELAY,
-    API_POOL_SIZE,
-    API_MAX_RETRIES,
-    BOT_TOKEN,
-    CACHE_TTL
-)
+from config import settings
+from middlewares.metrics import TelegramMetricsMiddleware
+from models.api import Task, TaskStats, UserInfo
+from middlewares.tracing import TracingRequestMiddleware
+from utils.codec import get_codec
 from utils.logger import setup_logger
+from utils.metrics import API_LATENCY, API_RETRIES, API_SHORT_CIRCUITS, CACHE_REQUESTS, endpoint_label
+from utils.resilience import CircuitBreaker, LatencyTracker, RetryBudget
+from utils.tracing import span
 
 logger = setup_logger(__name__)
 
-# Simple in-memory cache
+# Simple in-memory cache: key -> (expires_at, response)
 cache = {}
 
-def cache_key(func_name: str, *args, **kwargs) -> str:
-    """Generate cache key from function name and arguments"""
-    key = f"{func_name}:{str(args)}:{str(kwargs)}"
-    return hashlib.md5(key.encode()).hexdigest()
+CacheKeyFunc = Callable[..., Hashable]
 
-def cached(ttl: int = CACHE_TTL):
-    """Cache decorator for API responses"""
+def cache_key(func_name: str, *args, **kwargs) -> Hashable:
+    """Hashable cache key built from function name and explicit arguments"""
+    if kwargs:
+        return (func_name, args, tuple(sorted(kwargs.items())))
+    return (func_name, args)
+
+def cached(ttl: int = settings.cache_ttl, key: Optional[CacheKeyFunc] = None):
+    """Cache decorator for API responses
+
+    ``self`` is left out of the key for methods. ``key`` replaces the
+    default key for an endpoint; it receives the call arguments without
+    ``self`` and must return something hashable. Expired responses are
+    kept for ``settings.cache_stale_ttl`` and returned when the request fails.
+    """
     def decorator(func):
+        name = func.__name__
+        params = list(inspect.signature(func).parameters)
+        skip = 1 if params and params[0] == 'self' else 0
+
+        def make_key(args, kwargs) -> Hashable:
+            args = args[skip:]
+            if key is not None:
+                return (name, key(*args, **kwargs))
+            return cache_key(name, *args, **kwargs)
+
         @wraps(func)
         async def wrapper(*args, **kwargs):
-            key = cache_key(func.__name__, *args, **kwargs)
+            entry_key = make_key(args, kwargs)
             
             # Check cache
-            cached_data = cache.get(key)
+            cached_data = cache.get(entry_key)
             if cached_data:
-                timestamp, data = cached_data
-                if (datetime.now() - timestamp).seconds < ttl:
-                    logger.debug(f"Cache hit for {key}")
+                expires_at, data = cached_data
+                if time.monotonic() < expires_at:
+                    logger.debug("Cache hit for %s", entry_key)
+                    CACHE_REQUESTS.inc(function=name, result='hit')
                     return data
 
+            CACHE_REQUESTS.inc(function=name, result='miss')
             # Get fresh data
-            result = await func(*args, **kwargs)
+            try:
+                result = await func(*args, **kwargs)
+            except APIError as e:
+                # Backend unavailable: an expired response beats an error
+                if cached_data:
+                    logger.warning("Serving stale %s: %s", name, e.message)
+                    CACHE_REQUESTS.inc(function=name, result='stale')
+                    return cached_data[1]
+                raise
             
             # Cache successful responses only
-            if isinstance(result, tuple) and result[1] == 200:
-                cache[key] = (datetime.now(), result)
+            if isinstance(result, APIResponse) and result.success:
+                current_time = time.monotonic()
+                cache[entry_key] = (current_time + ttl, result)
                 
-                # Clean old cache entries
-                current_time = datetime.now()
+                # Clean entries too old to serve even as stale
+                stale_before = current_time - settings.cache_stale_ttl
                 expired_keys = [
-                    k for k, (timestamp, _) in cache.items()
-                    if (current_time - timestamp).seconds > ttl
+                    k for k, (expires_at, _) in cache.items()
+                    if expires_at <= stale_before
                 ]
                 for k in expired_keys:
                     cache.pop(k, None)
             
             return result
+
+        def invalidate(*args, **kwargs):
+            """Drop cached result for the given call arguments"""
+            cache.pop(make_key(args, kwargs), None)
+
+        def invalidate_if(predicate: Callable[[Any], bool]):
+            """Drop every cached result of this function matching ``predicate``"""
+            for entry_key in [
+                k for k, (_, response) in cache.items()
+                if k[0] == name and predicate(response)
+            ]:
+                cache.pop(entry_key, None)
+
+        wrapper.invalidate = invalidate
+        wrapper.invalidate_if = invalidate_if
         return wrapper
     return decorator
 
 class APIResponse:
     """Wrapper for API responses with proper typing and error handling"""
+    __slots__ = ('data', 'status_code', 'error', 'success', 'result')
+
     def __init__(
         self,
-        data: Dict[str, Any],
+        data: Optional[Dict[str, Any]],
         status_code: int,
-        error: Optional[str] = None
+        error: Optional[str] = None,
+        result: Any = None
     ):
+        # None when the response had no body
         self.data = data
         self.status_code = status_code
         self.error = error
         self.success = 200 <= status_code < 300 and not error
+        # Typed model(s) parsed from the payload, see ``parse_response``
+        self.result = result
+
+    @property
+    def ok(self) -> bool:
+        """Request succeeded and the backend reported ``status: success``"""
+        # Empty and 204 bodies have no payload to report a status
+        return (
+            self.success
+            and isinstance(self.data, dict)
+            and self.data.get('status') == 'success'
+        )
 
     @property
     def message(self) -> str:
         """Get human-readable message from response"""
         if self.error:
             return self.error
-        return self.data.get('message', '')
+        if isinstance(self.data, dict):
+            return self.data.get('message', '')
+        return ''
 
     def __bool__(self) -> bool:
         return self.success
 
+def parse_response(response: APIResponse, field: str, model) -> APIResponse:
+    """Replace ``field`` of a successful payload with ``model`` instances
+
+    Lists become lists of models. The raw dicts are dropped, so cached
+    responses only hold the compact models.
+    """
+    if not response.ok:
+        return response
+    raw = response.data.get(field)
+    if isinstance(raw, list):
+        result = [model.from_dict(item) for item in raw]
+    else:
+        result = model.from_dict(raw) if raw else None
+    data = {key: value for key, value in response.data.items() if key != field}
+    return APIResponse(data, response.status_code, response.error, result)
+
 class APIError(Exception):
     """Custom exception for API errors"""
     def __init__(self, message: str, status_code: int = 500):
@@ -98,6 +175,15 @@ class APIError(Exception):
         self.status_code = status_code
         super().__init__(self.message)
 
+class CircuitOpenError(APIError):
+    """Raised without a request while an endpoint's circuit is open"""
+    def __init__(self, endpoint: str):
+        super().__init__(f"Circuit open for {endpoint}", 503)
+
+def retry_delay(attempt: int) -> float:
+    """Exponential backoff with full jitter: up to 1, 2, 4... seconds"""
+    return random.uniform(0, settings.api_retry_delay * 2 ** (attempt - 1))
+
 class APIClient:
     """Asynchronous API client with connection pooling and retry logic"""
     _instance = None
@@ -112,11 +198,13 @@ class APIClient:
 
     def __init__(self):
         if not APIClient._initialized:
-            self.base_url = API_URL.rstrip('/')
-            self.timeout = ClientTimeout(total=API_TIMEOUT)
-            self.retry_count = API_RETRY_COUNT
-            self.retry_delay = API_RETRY_DELAY
+            self.base_url = settings.api_url.rstrip('/')
+            self.timeout = ClientTimeout(total=settings.api_timeout)
             self.logger = setup_logger('api_client')
+            self.breakers: Dict[str, CircuitBreaker] = {}
+            self.latencies: Dict[str, LatencyTracker] = {}
+            self.retry_budget = RetryBudget()
+            self.codec = get_codec(settings.json_codec)
             APIClient._initialized = True
 
     async def __aenter__(self):
@@ -132,13 +220,14 @@ class APIClient:
         """Ensure session exists and is active"""
         if cls._session is None or cls._session.closed:
             connector = TCPConnector(
-                limit=API_POOL_SIZE,
-                ttl_dns_cache=300,
+                limit=settings.api_pool_size,
+                ttl_dns_cache=settings.api_dns_cache_ttl,
+                ssl=settings.api_verify_ssl,
                 enable_cleanup_closed=True
             )
             cls._session = ClientSession(
                 connector=connector,
-                timeout=ClientTimeout(total=API_TIMEOUT)
+                timeout=ClientTimeout(total=settings.api_timeout)
             )
         return cls._session
 
@@ -146,9 +235,32 @@ class APIClient:
     async def get_bot(cls) -> Bot:
         """Get or create bot instance"""
         if cls._bot is None:
-            cls._bot = Bot(token=BOT_TOKEN)
+            cls._bot = Bot(token=settings.bot_token)
+            cls._bot.session.middleware(TelegramMetricsMiddleware())
+            if settings.tracing_enabled:
+                cls._bot.session.middleware(TracingRequestMiddleware())
         return cls._bot
 
+    async def warm_up(self, connections: int = settings.api_warm_connections):
+        """Open pooled keep-alive connections to the backend before the first update"""
+        session = await self.ensure_session()
+        timeout = ClientTimeout(total=settings.api_timeout_min)
+
+        async def connect():
+            async with session.head(self.base_url, timeout=timeout) as response:
+                await response.read()
+
+        results = await asyncio.gather(
+            *(connect() for _ in range(connections)),
+            return_exceptions=True
+        )
+        errors = [result for result in results if isinstance(result, Exception)]
+        if errors:
+            self.logger.warning(
+                "Backend warm-up: %s of %s connections failed: %s",
+                len(errors), connections, errors[0]
+            )
+
     @classmethod
     async def close(cls):
         """Close all connections"""
@@ -161,12 +273,6 @@ class APIClient:
                 await cls._bot.session.close()
             cls._bot = None
 
-    @backoff.on_exception(
-        backoff.expo,
-        (aiohttp.ClientError, asyncio.TimeoutError, APIError),
-        max_tries=API_MAX_RETRIES,
-        max_time=API_TIMEOUT
-    )
     async def _make_request(
         self,
         method: str,
@@ -175,42 +281,133 @@ class APIClient:
         params: Optional[Dict] = None,
         files: Optional[List[Dict]] = None
     ) -> APIResponse:
-        """Make HTTP request with retry logic and proper error handling"""
-        session = await self.ensure_session()
-        url = f"{self.base_url}/api/{endpoint.lstrip('/')}"
-        headers = {}
+        """Make HTTP request with retries, a circuit breaker and adaptive timeout
+
+        Failed attempts are retried while the retry budget allows it and
+        the whole call stays within ``settings.api_timeout``. 5xx responses and
+        request errors count towards opening the endpoint's circuit.
+        """
+        label = endpoint_label(endpoint)
+        breaker = self.breakers.get(label)
+        if breaker is None:
+            breaker = self.breakers[label] = CircuitBreaker()
+        latency = self.latencies.get(label)
+        if latency is None:
+            latency = self.latencies[label] = LatencyTracker()
 
         # Prepare request
+        headers = {}
         if isinstance(data, dict):
             headers['Content-Type'] = 'application/json'
-            data = json.dumps(data)
+            data = self.codec.dumps(data)
+
+        self.retry_budget.deposit()
+        deadline = time.monotonic() + settings.api_timeout
+        attempt = 0
+        while True:
+            if not breaker.allow():
+                API_SHORT_CIRCUITS.inc(endpoint=label)
+                raise CircuitOpenError(label)
+            # An attempt never runs past the deadline of the whole call
+            timeout = min(latency.timeout(), deadline - time.monotonic())
+            if timeout <= 0:
+                raise APIError("Request timeout", 408)
+            try:
+                response = await self._send(
+                    method, endpoint, label, data, params, headers, latency, timeout
+                )
+            except APIError:
+                breaker.record_failure()
+                attempt += 1
+                delay = retry_delay(attempt)
+                if (
+                    attempt >= settings.api_max_retries
+                    or time.monotonic() + delay >= deadline
+                    or not self.retry_budget.withdraw()
+                ):
+                    raise
+                API_RETRIES.inc(endpoint=label)
+                await asyncio.sleep(delay)
+                continue
+
+            if response.status_code >= 500:
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+            return response
+
+    async def _send(
+        self,
+        method: str,
+        endpoint: str,
+        label: str,
+        data: Optional[Union[bytes, aiohttp.FormData]],
+        params: Optional[Dict],
+        headers: Dict[str, str],
+        latency: LatencyTracker,
+        timeout: float
+    ) -> APIResponse:
+        """Single request attempt limited to ``timeout`` seconds"""
+        session = await self.ensure_session()
+        url = f"{self.base_url}/api/{endpoint.lstrip('/')}"
         
         # Log request
-        self.logger.debug(f"Making {method} request to {url}")
+        self.logger.debug("Making %s request to %s", method, url)
+        start = time.perf_counter()
+        status = 'error'
+        request_span = span(
+            'api.request',
+            **{'http.method': method, 'api.endpoint': label}
+        )
         
-        try:
-            async with session.request(
-                method=method,
-                url=url,
-                data=data,
-                params=params,
-                headers=headers,
-                timeout=self.timeout
-            ) as response:
-                try:
-                    result = await response.json()
+        with request_span:
+            try:
+                async with session.request(
+                    method=method,
+                    url=url,
+                    data=data,
+                    params=params,
+                    headers=headers,
+                    timeout=ClientTimeout(total=timeout)
+                ) as response:
+                    status = response.status
+                    body = await response.read()
+                    if body.strip() and 'json' not in response.content_type:
+                        self.logger.error("Invalid JSON response: %s", body[:500])
+                        raise APIError("Invalid response format", response.status)
+                    try:
+                        result = self.codec.loads(body) if body.strip() else None
+                    except ValueError:
+                        self.logger.error("Malformed JSON response: %s", body[:500])
+                        raise APIError("Invalid response format", response.status)
+
+                    elapsed = time.perf_counter() - start
+                    latency.observe(elapsed)
+                    if self.logger.isEnabledFor(logging.DEBUG):
+                        latency_ms = round(elapsed * 1000, 2)
+                        self.logger.debug(
+                            "%s %s -> %s in %s ms", method, url, response.status, latency_ms,
+                            extra={'latency': latency_ms, 'status': response.status}
+                        )
                     return APIResponse(result, response.status)
-                except aiohttp.ContentTypeError:
-                    text = await response.text()
-                    self.logger.error(f"Invalid JSON response: {text}")
-                    raise APIError("Invalid response format", response.status)
-
-        except asyncio.TimeoutError:
-            self.logger.error(f"Request timeout for {url}")
-            raise APIError("Request timeout", 408)
-        except Exception as e:
-            self.logger.error(f"Request error: {str(e)}")
-            raise APIError(str(e))
+
+            except asyncio.TimeoutError:
+                status = 'timeout'
+                latency.observe_timeout(timeout)
+                self.logger.error("Request timeout for %s", url)
+                raise APIError("Request timeout", 408)
+            except APIError:
+                raise
+            except Exception as e:
+                self.logger.error("Request error: %s", e)
+                raise APIError(str(e))
+            finally:
+                request_span.set_attribute('http.status_code', status)
+                API_LATENCY.observe(
+                    time.perf_counter() - start,
+                    endpoint=label,
+                    status=status
+                )
 
     @staticmethod
     def clean_phone_number(phone: str) -> str:
@@ -232,12 +429,13 @@ class APIClient:
 
     @cached(ttl=300)  # Cache for 5 minutes
     async def get_user_info(self, telegram_id: int) -> APIResponse:
-        """Get user information"""
-        return await self._make_request(
+        """Get user information as ``UserInfo``"""
+        response = await self._make_request(
             'GET',
             'user-info/',
             params={'telegram_id': telegram_id}
         )
+        return parse_response(response, 'user', UserInfo)
 
     async def verify_user(
         self,
@@ -250,7 +448,7 @@ class APIClient:
             phone = self.clean_phone_number(phone)
             jshir = self.validate_jshir(jshir)
 
-            return await self._make_request(
+            response = await self._make_request(
                 'POST',
                 'verify-user/',
                 {
@@ -259,27 +457,31 @@ class APIClient:
                     'telegram_id': telegram_id
                 }
             )
+            return parse_response(response, 'user', UserInfo)
         except ValueError as e:
             return APIResponse({'message': str(e)}, 400, str(e))
 
     @cached(ttl=60)  # Cache for 1 minute
     async def get_user_tasks(self, telegram_id: int) -> APIResponse:
-        """Get user tasks"""
-        return await self._make_request(
+        """Get user tasks as a list of ``Task``"""
+        response = await self._make_request(
             'GET',
             'tasks/',
             params={'telegram_id': telegram_id}
         )
+        return parse_response(response, 'tasks', Task)
 
     @cached(ttl=60)
     async def get_task_detail(self, task_id: int) -> APIResponse:
-        """Get task details"""
-        return await self._make_request('GET', f'tasks/{task_id}/')
+        """Get task details as ``Task``"""
+        response = await self._make_request('GET', f'tasks/{task_id}/')
+        return parse_response(response, 'task', Task)
 
     @cached(ttl=60)
     async def get_task_stats(self, task_id: int) -> APIResponse:
-        """Get task statistics"""
-        return await self._make_request('GET', f'tasks/{task_id}/stats/')
+        """Get task statistics as ``TaskStats``"""
+        response = await self._make_request('GET', f'tasks/{task_id}/stats/')
+        return parse_response(response, 'stats', TaskStats)
 
     async def update_task_status(
         self,
@@ -296,11 +498,15 @@ class APIClient:
         if rejection_reason:
             data['rejection_reason'] = rejection_reason
         
-        return await self._make_request(
+        response = await self._make_request(
             'PATCH',
             f'tasks/{task_id}/status/',
             data
         )
+        response = parse_response(response, 'task', Task)
+        if response:
+            self.invalidate_task(task_id, telegram_id)
+        return response
 
     async def submit_task_progress(
         self,
@@ -328,7 +534,25 @@ class APIClient:
                             content_type=file_content[2]
                         )
 
-        return await self._make_request('POST', 'submit-progress/', form)
+        response = await self._make_request('POST', 'submit-progress/', form)
+        response = parse_response(response, 'task', Task)
+        if response:
+            self.invalidate_task(task_id, telegram_id)
+        return response
+
+    def invalidate_task(self, task_id: int, telegram_id: int):
+        """Drop cached task data changed by a mutation
+
+        ``telegram_id`` is whoever made the change; an admin changing a
+        task also makes the owner's cached task list stale, so every
+        cached list holding the task is dropped as well.
+        """
+        self.get_task_detail.invalidate(self, task_id)
+        self.get_task_stats.invalidate(self, task_id)
+        self.get_user_tasks.invalidate(self, telegram_id)
+        self.get_user_tasks.invalidate_if(
+            lambda response: any(task.id == task_id for task in response.result or ())
+        )
 
     async def download_telegram_file(
         self,
@@ -336,16 +560,19 @@ class APIClient:
     ) -> Optional[Tuple[bytes, str, str]]:
         """Download file from Telegram"""
         try:
-            bot = await self.get_bot()
-            file = await bot.get_file(file_id)
-            file_path = file.file_path
-            file_name = os.path.basename(file_path)
-            content_type = mimetypes.guess_type(file_name)[0] or 'application/octet-stream'
-
-            file_content = await bot.download_file(file_path)
-            return file_content.read(), file_name, content_type
+            with span('telegram.download', **{'file.id': file_id}) as download_span:
+                bot = await self.get_bot()
+                file = await bot.get_file(file_id)
+                file_path = file.file_path
+                file_name = os.path.basename(file_path)
+                content_type = mimetypes.guess_type(file_name)[0] or 'application/octet-stream'
+
+                file_content = await bot.download_file(file_path)
+                content = file_content.read()
+                download_span.set_attribute('file.size', len(content))
+                return content, file_name, content_type
         except Exception as e:
-            self.logger.error(f"File download error: {e}")
+            self.logger.error("File download error: %s", e)
             return None
 
 # Create global API client instance
@@ -0,0 +1,106 @@
+import base64
+import binascii
+import struct
+from enum import IntEnum
+from typing import Any, Awaitable, Callable, Dict, NamedTuple, Optional, Tuple, Union
+from aiogram.filters import Filter
+from aiogram.types import CallbackQuery
+
+CallbackHandler = Callable[..., Awaitable[Any]]
+
+# Marks packed callback data; not part of the urlsafe base64 alphabet
+PREFIX = "#"
+
+# action, task_id, page, value: 9 bytes -> 12 base64 characters, no padding
+_LAYOUT = struct.Struct('>BIHH')
+
+class Action(IntEnum):
+    TASK_VIEW = 1
+    TASK_STATS = 2
+    TASK_COMPLETE = 3
+    TASK_REJECT = 4
+    TASK_APPROVE = 5
+    TASK_STATUS = 6
+    TASK_MARK = 7
+    TASKS_PAGE = 8
+    TASKS_LIST = 9
+    NOOP = 10
+    TASK_PROGRESS = 11
+
+# Task statuses packed into ``value`` by their index
+TASK_STATUSES = ('pending', 'in_progress', 'completed', 'failed', 'cancelled')
+
+class CallbackPayload(NamedTuple):
+    """Decoded callback data
+
+    ``value`` carries a small action-specific code: the task list filter
+    for ``TASKS_PAGE`` and the status index for ``TASK_MARK``.
+    """
+    action: Action
+    task_id: int = 0
+    page: int = 0
+    value: int = 0
+
+    @property
+    def status(self) -> str:
+        return TASK_STATUSES[self.value]
+
+def pack(action: Action, task_id: int = 0, page: int = 0, value: int = 0) -> str:
+    """Pack callback state into 13 characters of callback data"""
+    raw = _LAYOUT.pack(action, task_id, page, value)
+    return PREFIX + base64.urlsafe_b64encode(raw).decode('ascii')
+
+def unpack(data: str) -> Optional[CallbackPayload]:
+    """Decode callback data in one pass, ``None`` if it is not packed"""
+    if len(data) != 13 or data[0] != PREFIX:
+        return None
+    try:
+        action, task_id, page, value = _LAYOUT.unpack(base64.urlsafe_b64decode(data[1:]))
+        return CallbackPayload(Action(action), task_id, page, value)
+    except (binascii.Error, struct.error, ValueError):
+        return None
+
+def status_code(status: str) -> int:
+    """Index of task status for ``TASK_MARK`` payloads"""
+    return TASK_STATUSES.index(status)
+
+class CallbackTable(Filter):
+    """Action-indexed dispatch table for callback queries
+
+    Callback data is decoded once with ``unpack`` and the action is
+    looked up in a dict, so resolving a callback costs the same no
+    matter how many actions are registered.
+    """
+    def __init__(self):
+        self._handlers: Dict[Action, CallbackHandler] = {}
+
+    def register(self, action: Action) -> Callable[[CallbackHandler], CallbackHandler]:
+        """Register handler for an action"""
+        def decorator(handler: CallbackHandler) -> CallbackHandler:
+            if action in self._handlers:
+                raise ValueError(f"Callback action already registered: {action!r}")
+            self._handlers[action] = handler
+            return handler
+        return decorator
+
+    def resolve(self, data: str) -> Optional[Tuple[CallbackHandler, CallbackPayload]]:
+        """Find handler and decoded payload for callback data"""
+        payload = unpack(data)
+        if payload is None:
+            return None
+
+        handler = self._handlers.get(payload.action)
+        if handler is None:
+            return None
+        return handler, payload
+
+    async def __call__(self, callback: CallbackQuery) -> Union[bool, Dict[str, Any]]:
+        if not callback.data:
+            return False
+
+        resolved = self.resolve(callback.data)
+        if resolved is None:
+            return False
+
+        handler, payload = resolved
+        return {'callback_handler': handler, 'callback_payload': payload}
@@ -0,0 +1,60 @@
+import json
+from typing import Any, Callable, Dict, NamedTuple, Union
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+class Codec(NamedTuple):
+    """JSON encoder/decoder pair
+
+    ``dumps`` returns UTF-8 bytes, ``loads`` accepts bytes or str and
+    raises ``ValueError`` on malformed input.
+    """
+    name: str
+    dumps: Callable[[Any], bytes]
+    loads: Callable[[Union[bytes, str]], Any]
+
+CODECS: Dict[str, Codec] = {}
+
+# Preferred order for ``auto``
+PREFERENCE = ('orjson', 'msgspec', 'json')
+
+def register(codec: Codec):
+    CODECS[codec.name] = codec
+
+def _stdlib_dumps(obj: Any) -> bytes:
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+register(Codec('json', _stdlib_dumps, json.loads))
+
+try:
+    import orjson
+except ImportError:
+    pass
+else:
+    register(Codec('orjson', orjson.dumps, orjson.loads))
+
+try:
+    import msgspec
+except ImportError:
+    pass
+else:
+    _msgspec_encoder = msgspec.json.Encoder()
+    _msgspec_decoder = msgspec.json.Decoder()
+
+    def _msgspec_loads(data: Union[bytes, str]) -> Any:
+        try:
+            return _msgspec_decoder.decode(data)
+        except msgspec.DecodeError as e:
+            raise ValueError(str(e)) from e
+
+    register(Codec('msgspec', _msgspec_encoder.encode, _msgspec_loads))
+
+def get_codec(name: str = 'auto') -> Codec:
+    """Codec by name; ``auto`` or an uninstalled codec picks the fastest available"""
+    codec = CODECS.get(name)
+    if codec is not None:
+        return codec
+    if name != 'auto':
+        logger.warning("JSON codec %s is not available, falling back", name)
+    return next(CODECS[preferred] for preferred in PREFERENCE if preferred in CODECS)
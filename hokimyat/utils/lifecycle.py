@@ -0,0 +1,93 @@
+import asyncio
+import inspect
+from contextlib import contextmanager
+from typing import Any, Callable, List, NamedTuple, Optional, Set
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+class Resource(NamedTuple):
+    """Pooled resource warmed on startup and closed on shutdown"""
+    name: str
+    warm: Optional[Callable[[], Any]] = None
+    close: Optional[Callable[[], Any]] = None
+
+async def _call(func: Callable[[], Any]):
+    result = func()
+    if inspect.isawaitable(result):
+        await result
+
+class Lifecycle:
+    """In-flight work and pooled resources of one bot process
+
+    Updates run inside ``track()`` so shutdown can wait for them. Long
+    jobs such as broadcasts check ``stopping`` between steps and stop at
+    the next checkpoint once shutdown has begun. Modules that own a pool
+    (the database engine) register it with ``add_resource``.
+    """
+    def __init__(self):
+        self.stopping = False
+        self._tasks: Set[asyncio.Task] = set()
+        self._resources: List[Resource] = []
+
+    def add_resource(
+        self,
+        name: str,
+        warm: Optional[Callable[[], Any]] = None,
+        close: Optional[Callable[[], Any]] = None
+    ):
+        """Register a pool; resources are closed in registration order"""
+        self._resources.append(Resource(name, warm, close))
+
+    @contextmanager
+    def track(self):
+        """Mark the current task as in-flight work to drain on shutdown"""
+        task = asyncio.current_task()
+        self._tasks.add(task)
+        try:
+            yield
+        finally:
+            self._tasks.discard(task)
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._tasks)
+
+    async def warm(self):
+        for resource in self._resources:
+            if resource.warm is None:
+                continue
+            try:
+                await _call(resource.warm)
+            except Exception as e:
+                # A cold pool only costs the first request some latency
+                logger.warning("Failed to warm %s: %s", resource.name, e)
+
+    async def drain(self, timeout: float) -> int:
+        """Wait up to ``timeout`` seconds for in-flight work, cancel the rest
+
+        Returns the number of tasks that had to be cancelled.
+        """
+        self.stopping = True
+        current = asyncio.current_task()
+        pending = {task for task in self._tasks if task is not current}
+        if pending:
+            logger.info("Waiting for %s in-flight updates", len(pending))
+            _, pending = await asyncio.wait(pending, timeout=timeout)
+        for task in pending:
+            task.cancel()
+        if pending:
+            logger.warning("Cancelled %s updates still running after %ss", len(pending), timeout)
+            await asyncio.wait(pending)
+        return len(pending)
+
+    async def close(self):
+        for resource in self._resources:
+            if resource.close is None:
+                continue
+            try:
+                await _call(resource.close)
+            except Exception as e:
+                logger.error("Failed to close %s: %s", resource.name, e)
+
+lifecycle = Lifecycle()
@@ -1,18 +1,105 @@
 
+import atexit
+import json
 import logging
+import queue
+from contextvars import ContextVar
+from logging.handlers import (
+    QueueHandler,
+    QueueListener,
+    RotatingFileHandler,
+    TimedRotatingFileHandler
+)
+from config import settings
 
-def setup_logger(name):
-    logger = logging.getLogger(name)
-    logger.setLevel(logging.INFO)
+_listener = None
+
+# Fields emitted as top-level keys in JSON mode
+STRUCTURED_FIELDS = ('user_id', 'handler', 'task_id', 'latency', 'status')
+
+# Per-update fields, set by middlewares.log_context
+log_context: ContextVar[dict] = ContextVar('log_context', default={})
+
+class ContextFilter(logging.Filter):
+    """Copy per-update context onto records before they leave the event loop"""
+    def filter(self, record: logging.LogRecord) -> bool:
+        for key, value in log_context.get().items():
+            if not hasattr(record, key):
+                setattr(record, key, value)
+        return True
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line with structured fields as keys"""
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'time': self.formatTime(record),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage()
+        }
+        for field in STRUCTURED_FIELDS:
+            value = getattr(record, field, None)
+            if value is not None:
+                entry[field] = value
+        if record.exc_info:
+            entry['exc_info'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
 
-    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+def _file_handler() -> logging.Handler:
+    """Rotating file handler, by time if log_rotate_when is set, else by size"""
+    if settings.log_rotate_when:
+        return TimedRotatingFileHandler(
+            settings.log_file,
+            when=settings.log_rotate_when,
+            backupCount=settings.log_backup_count,
+            encoding='utf-8'
+        )
+    return RotatingFileHandler(
+        settings.log_file,
+        maxBytes=settings.log_max_bytes,
+        backupCount=settings.log_backup_count,
+        encoding='utf-8'
+    )
 
-    console_handler = logging.StreamHandler()
-    console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
+def configure_logging():
+    """Send all records through a queue written by a background thread
 
-    file_handler = logging.FileHandler('bot.log')
-    file_handler.setFormatter(formatter)
-    logger.addHandler(file_handler)
+    Only the root logger gets a handler, so calling this again (or calling
+    setup_logger from every module) never duplicates output. Handlers do
+    their console and disk I/O on the listener thread, not the event loop.
+    """
+    global _listener
+    if _listener is not None:
+        return
 
-    return logger
+    formatter = JsonFormatter() if settings.log_json else logging.Formatter(settings.log_format)
+    handlers = [logging.StreamHandler()]
+    if settings.log_file:
+        handlers.append(_file_handler())
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    log_queue = queue.SimpleQueue()
+    root = logging.getLogger()
+    queue_handler = QueueHandler(log_queue)
+    queue_handler.addFilter(ContextFilter())
+    root.addHandler(queue_handler)
+    root.setLevel(settings.log_level.upper())
+
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logging)
+
+def shutdown_logging():
+    """Flush queued records and stop the listener thread"""
+    global _listener
+    if _listener is None:
+        return
+    _listener.stop()
+    for handler in _listener.handlers:
+        handler.close()
+    _listener = None
+
+def setup_logger(name):
+    configure_logging()
+    return logging.getLogger(name)
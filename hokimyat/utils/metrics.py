@@ -0,0 +1,196 @@
+import bisect
+import re
+from typing import Dict, Iterable, List, Optional, Tuple
+from aiohttp import web
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+_ID_PATTERN = re.compile(r'\d+')
+
+def _escape(value) -> str:
+    return str(value).replace('\\', r'\\').replace('"', r'\"').replace('\n', r'\n')
+
+def _format_labels(names: Tuple[str, ...], values: Tuple, extra: str = '') -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+def endpoint_label(endpoint: str) -> str:
+    """Collapse ids in an API path so each endpoint is one label value"""
+    return _ID_PATTERN.sub('{id}', endpoint.strip('/'))
+
+class Metric:
+    """Base class for metrics rendered in Prometheus text format"""
+    kind = ''
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        REGISTRY.register(self)
+
+    def _key(self, labels: Dict[str, object]) -> Tuple:
+        return tuple(labels.get(name, '') for name in self.labelnames)
+
+    def samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.kind}"
+        ]
+        lines.extend(self.samples())
+        return '\n'.join(lines)
+
+class Counter(Metric):
+    kind = 'counter'
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple, float] = {}
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def samples(self) -> List[str]:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {value}"
+            for key, value in self._values.items()
+        ]
+
+class Histogram(Metric):
+    kind = 'histogram'
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        buckets: Tuple[float, ...] = DEFAULT_BUCKETS
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> [per-bucket counts, sum, count]
+        self._values: Dict[Tuple, list] = {}
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        entry = self._values.get(key)
+        if entry is None:
+            entry = self._values[key] = [[0] * len(self.buckets), 0.0, 0]
+        index = bisect.bisect_left(self.buckets, value)
+        if index < len(self.buckets):
+            entry[0][index] += 1
+        entry[1] += value
+        entry[2] += 1
+
+    def count(self, **labels) -> int:
+        entry = self._values.get(self._key(labels))
+        return entry[2] if entry else 0
+
+    def samples(self) -> List[str]:
+        lines = []
+        for key, (counts, total, count) in self._values.items():
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                labels = _format_labels(self.labelnames, key, f'le="{bound}"')
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, key, 'le="+Inf"')
+            lines.append(f"{self.name}_bucket{labels} {count}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {total}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+class Registry:
+    """Collection of metrics exposed on the metrics endpoint"""
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+
+    def register(self, metric: Metric):
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric already registered: {metric.name}")
+        self._metrics[metric.name] = metric
+
+    def render(self) -> str:
+        return '\n'.join(metric.render() for metric in self._metrics.values()) + '\n'
+
+REGISTRY = Registry()
+
+HANDLER_LATENCY = Histogram(
+    'bot_handler_latency_seconds',
+    "Time spent handling an update",
+    ('router', 'handler')
+)
+API_LATENCY = Histogram(
+    'bot_api_request_seconds',
+    "Backend API request latency",
+    ('endpoint', 'status')
+)
+API_RETRIES = Counter(
+    'bot_api_retries_total',
+    "Backend API request retries",
+    ('endpoint',)
+)
+API_SHORT_CIRCUITS = Counter(
+    'bot_api_short_circuits_total',
+    "Backend requests failed fast by an open circuit",
+    ('endpoint',)
+)
+CACHE_REQUESTS = Counter(
+    'bot_cache_requests_total',
+    "API cache lookups",
+    ('function', 'result')
+)
+TELEGRAM_REQUESTS = Counter(
+    'bot_telegram_requests_total',
+    "Outgoing Telegram Bot API calls",
+    ('method',)
+)
+TELEGRAM_RETRY_AFTER = Counter(
+    'bot_telegram_retry_after_total',
+    "Telegram 429 Too Many Requests responses",
+    ('method',)
+)
+BROADCAST_MESSAGES = Counter(
+    'bot_broadcast_messages_total',
+    "Broadcast messages by result",
+    ('result',)
+)
+BROADCAST_DURATION = Histogram(
+    'bot_broadcast_duration_seconds',
+    "Duration of a whole broadcast",
+    buckets=(1, 5, 15, 30, 60, 120, 300, 600, 1800)
+)
+
+async def metrics_view(request: web.Request) -> web.Response:
+    return web.Response(
+        text=REGISTRY.render(),
+        content_type='text/plain',
+        charset='utf-8'
+    )
+
+async def start_metrics_server(host: str, port: int) -> Optional[web.AppRunner]:
+    """Serve ``/metrics`` in text exposition format on a local port"""
+    app = web.Application()
+    app.router.add_get('/metrics', metrics_view)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    try:
+        await web.TCPSite(runner, host, port).start()
+    except OSError as e:
+        logger.error("Metrics server could not bind %s:%s: %s", host, port, e)
+        await runner.cleanup()
+        return None
+    logger.info("Metrics available on http://%s:%s/metrics", host, port)
+    return runner
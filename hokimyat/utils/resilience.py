@@ -0,0 +1,130 @@
+import time
+from collections import deque
+from config import settings
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+class CircuitBreaker:
+    """Fails fast after repeated failures of one endpoint
+
+    Opens after ``failure_threshold`` consecutive failures. Once
+    ``reset_timeout`` has passed a single probe request is let through:
+    success closes the circuit, failure opens it again. A probe that
+    never reports back is replaced after another ``reset_timeout``.
+    """
+    __slots__ = ('failure_threshold', 'reset_timeout', 'state', 'failures', 'opened_at')
+
+    def __init__(
+        self,
+        failure_threshold: int = settings.circuit_failure_threshold,
+        reset_timeout: float = settings.circuit_reset_timeout
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+
+    def allow(self) -> bool:
+        """Whether a request may be sent now"""
+        if self.state == CLOSED:
+            return True
+        now = time.monotonic()
+        if now - self.opened_at < self.reset_timeout:
+            return False
+        # Let one probe through and restart the clock for the next one
+        self.state = HALF_OPEN
+        self.opened_at = now
+        return True
+
+    def record_success(self):
+        self.state = CLOSED
+        self.failures = 0
+
+    def record_failure(self):
+        self.failures += 1
+        if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+            self.state = OPEN
+            self.opened_at = time.monotonic()
+
+class LatencyTracker:
+    """Request timeout derived from recent latencies of one endpoint
+
+    The timeout is ``multiplier`` times the ``percentile`` latency of the
+    last ``window`` requests, kept within ``[floor, ceiling]``. Until
+    ``min_samples`` requests were observed the ceiling is used. A request
+    that timed out took at least its timeout: that is recorded as its
+    latency and the timeout doubles at once, so a backend that got slower
+    than the learned timeout isn't cut off on every request.
+    """
+    __slots__ = (
+        'floor', 'ceiling', 'multiplier', 'percentile',
+        'min_samples', '_samples', '_pending', '_timeout'
+    )
+
+    # Observations between percentile recalculations
+    RECOMPUTE_EVERY = 10
+
+    def __init__(
+        self,
+        floor: float = settings.api_timeout_min,
+        ceiling: float = settings.api_timeout,
+        multiplier: float = settings.api_timeout_multiplier,
+        percentile: float = 0.99,
+        window: int = 200,
+        min_samples: int = 20
+    ):
+        self.floor = floor
+        self.ceiling = ceiling
+        self.multiplier = multiplier
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self._samples = deque(maxlen=window)
+        self._pending = 0
+        self._timeout = ceiling
+
+    def observe(self, seconds: float):
+        self._samples.append(seconds)
+        self._pending += 1
+        if self._pending >= self.RECOMPUTE_EVERY and len(self._samples) >= self.min_samples:
+            self._pending = 0
+            ordered = sorted(self._samples)
+            latency = ordered[int(self.percentile * (len(ordered) - 1))]
+            self._timeout = min(self.ceiling, max(self.floor, latency * self.multiplier))
+
+    def observe_timeout(self, seconds: float):
+        """Record a request abandoned after ``seconds``"""
+        self.observe(seconds)
+        self._timeout = min(self.ceiling, max(self._timeout * 2, seconds))
+
+    def timeout(self) -> float:
+        return self._timeout
+
+class RetryBudget:
+    """Caps retries at a fixed fraction of requests
+
+    Every request deposits ``ratio`` of a token and every retry spends a
+    whole one, so retries can't exceed ``ratio`` of traffic plus the
+    ``burst`` the balance starts with and is capped at.
+    """
+    __slots__ = ('ratio', 'burst', 'balance')
+
+    def __init__(
+        self,
+        ratio: float = settings.retry_budget_ratio,
+        burst: int = settings.retry_budget_burst
+    ):
+        self.ratio = ratio
+        self.burst = burst
+        self.balance = float(burst)
+
+    def deposit(self):
+        self.balance = min(self.burst, self.balance + self.ratio)
+
+    def withdraw(self) -> bool:
+        if self.balance < 1:
+            return False
+        self.balance -= 1
+        return True
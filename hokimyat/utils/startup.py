@@ -0,0 +1,66 @@
+"""Import-time profile of the bot entry point
+
+The profile runs in a fresh interpreter with ``-X importtime``, so no
+module is already in ``sys.modules`` and the numbers match a cold start.
+"""
+import os
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from typing import List, NamedTuple, Tuple
+
+BOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Everything that runs before the first update can be handled
+STARTUP_CODE = "import bot; bot.create_dispatcher()"
+
+class ImportTiming(NamedTuple):
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+def parse_importtime(output: str) -> List[ImportTiming]:
+    """Timings from ``-X importtime`` lines, in the order they were printed"""
+    timings = []
+    for line in output.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|', 2)
+        if not self_us.strip().isdigit():
+            continue  # the header line
+        name = name[1:]
+        timings.append(ImportTiming(
+            name.strip(), int(self_us), int(cumulative_us), (len(name) - len(name.lstrip())) // 2
+        ))
+    return timings
+
+def profile_startup(code: str = STARTUP_CODE) -> Tuple[List[ImportTiming], float]:
+    """Import timings and wall-clock seconds of running ``code`` in the bot directory"""
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        cwd=BOT_DIR, capture_output=True, text=True
+    )
+    wall = time.perf_counter() - started
+    if result.returncode:
+        raise RuntimeError(f"Startup failed:\n{result.stderr[-2000:]}")
+    return parse_importtime(result.stderr), wall
+
+def format_report(timings: List[ImportTiming], wall: float, top: int = 25) -> str:
+    """Slowest top-level packages and modules by time spent in their own body"""
+    packages = defaultdict(int)
+    for timing in timings:
+        packages[timing.module.partition('.')[0]] += timing.self_us
+    total = sum(packages.values())
+
+    lines = [f"Startup {wall * 1000:.0f} ms, imports {total / 1000:.0f} ms in {len(timings)} modules", ""]
+    lines.append(f"{'self ms':>10}  package")
+    for package, self_us in sorted(packages.items(), key=lambda item: -item[1])[:top]:
+        lines.append(f"{self_us / 1000:>10.1f}  {package}")
+    lines.append("")
+    lines.append(f"{'self ms':>10}{'cumul ms':>10}  module")
+    for timing in sorted(timings, key=lambda timing: -timing.self_us)[:top]:
+        lines.append(f"{timing.self_us / 1000:>10.1f}{timing.cumulative_us / 1000:>10.1f}  {timing.module}")
+    return '\n'.join(lines)
@@ -0,0 +1,34 @@
+import asyncio
+from typing import Any, Awaitable, List, Optional
+from aiogram.exceptions import TelegramBadRequest
+from aiogram.types import InlineKeyboardMarkup, Message
+
+async def _await(call: Awaitable) -> Any:
+    return await call
+
+async def gather_calls(*calls: Awaitable) -> List[Any]:
+    """``asyncio.gather`` that also accepts aiogram method calls
+
+    Shortcuts such as ``message.answer()`` return unhashable
+    ``TelegramMethod`` objects which ``asyncio.gather`` rejects, so each
+    call is awaited inside its own coroutine.
+    """
+    return await asyncio.gather(*(_await(call) for call in calls))
+
+async def edit_markup(message: Message, markup: Optional[InlineKeyboardMarkup]) -> bool:
+    """Replace the message keyboard unless it already shows ``markup``
+
+    Telegram rejects edits that change nothing ("message is not
+    modified"), which happens when the active filter or page is tapped
+    again. Returns whether the message was edited.
+    """
+    if message.reply_markup == markup:
+        return False
+    try:
+        await message.edit_reply_markup(reply_markup=markup)
+    except TelegramBadRequest as e:
+        # A concurrent tap may have applied the same edit first
+        if "message is not modified" not in e.message:
+            raise
+        return False
+    return True
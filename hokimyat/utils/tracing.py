@@ -0,0 +1,170 @@
+import asyncio
+import json
+import random
+import time
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional
+from sqlalchemy import event
+from config import settings
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+SERVICE_NAME = 'hokimyat-bot'
+
+# OTLP status codes
+STATUS_OK = 1
+STATUS_ERROR = 2
+
+class Span:
+    """Timed operation inside an update trace"""
+    __slots__ = (
+        'name', 'trace', 'span_id', 'parent_id',
+        'start_ns', 'end_ns', 'attributes', 'status', '_token'
+    )
+
+    def __init__(self, name: str, trace: 'Trace', parent_id: Optional[str], attributes: Dict[str, Any]):
+        self.name = name
+        self.trace = trace
+        self.span_id = f"{random.getrandbits(64):016x}"
+        self.parent_id = parent_id
+        self.start_ns = 0
+        self.end_ns = 0
+        self.attributes = attributes
+        self.status = STATUS_OK
+        self._token = None
+
+    def set_attribute(self, key: str, value: Any):
+        self.attributes[key] = value
+
+    def __enter__(self) -> 'Span':
+        self.start_ns = time.time_ns()
+        self._token = _current_span.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.end_ns = time.time_ns()
+        if exc_type is not None:
+            self.status = STATUS_ERROR
+            self.attributes['exception.type'] = exc_type.__name__
+        _current_span.reset(self._token)
+        self.trace.spans.append(self)
+        return False
+
+    def to_otlp(self) -> Dict[str, Any]:
+        span = {
+            'traceId': self.trace.trace_id,
+            'spanId': self.span_id,
+            'name': self.name,
+            'kind': 1,
+            'startTimeUnixNano': str(self.start_ns),
+            'endTimeUnixNano': str(self.end_ns),
+            'attributes': [_otlp_attribute(key, value) for key, value in self.attributes.items()],
+            'status': {'code': self.status}
+        }
+        if self.parent_id:
+            span['parentSpanId'] = self.parent_id
+        return span
+
+class Trace:
+    """Spans recorded while handling one update"""
+    __slots__ = ('trace_id', 'spans')
+
+    def __init__(self):
+        self.trace_id = f"{random.getrandbits(128):032x}"
+        self.spans: List[Span] = []
+
+    @property
+    def duration_ms(self) -> float:
+        root = self.spans[-1]
+        return (root.end_ns - root.start_ns) / 1e6
+
+    def to_otlp(self) -> Dict[str, Any]:
+        """OTLP/JSON ``ExportTraceServiceRequest`` with a single resource"""
+        return {
+            'resourceSpans': [{
+                'resource': {
+                    'attributes': [_otlp_attribute('service.name', SERVICE_NAME)]
+                },
+                'scopeSpans': [{
+                    'scope': {'name': 'utils.tracing'},
+                    'spans': [span.to_otlp() for span in self.spans]
+                }]
+            }]
+        }
+
+class _NoopSpan:
+    """Returned when no trace is active so instrumentation costs nothing"""
+    __slots__ = ()
+
+    def set_attribute(self, key: str, value: Any):
+        pass
+
+    def __enter__(self) -> '_NoopSpan':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+_NOOP_SPAN = _NoopSpan()
+_current_span: ContextVar[Optional[Span]] = ContextVar('current_span', default=None)
+
+def _otlp_attribute(key: str, value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        typed = {'boolValue': value}
+    elif isinstance(value, int):
+        typed = {'intValue': str(value)}
+    elif isinstance(value, float):
+        typed = {'doubleValue': value}
+    else:
+        typed = {'stringValue': str(value)}
+    return {'key': key, 'value': typed}
+
+def start_trace(name: str, **attributes) -> Span:
+    """Root span of a new trace; use as a context manager"""
+    return Span(name, Trace(), None, attributes)
+
+def span(name: str, **attributes):
+    """Child span of the current trace, no-op outside a trace"""
+    parent = _current_span.get()
+    if parent is None:
+        return _NOOP_SPAN
+    return Span(name, parent.trace, parent.span_id, attributes)
+
+def _append_line(path: str, line: str):
+    with open(path, 'a', encoding='utf-8') as trace_file:
+        trace_file.write(line + '\n')
+
+async def export_if_slow(trace: Trace):
+    """Append trace to the trace file as one OTLP/JSON line if it exceeded trace_slow_ms"""
+    if not settings.tracing_enabled or not trace.spans:
+        return
+    if trace.duration_ms < settings.trace_slow_ms:
+        return
+    line = json.dumps(trace.to_otlp(), ensure_ascii=False)
+    loop = asyncio.get_running_loop()
+    try:
+        await loop.run_in_executor(None, _append_line, settings.trace_file, line)
+    except OSError as e:
+        logger.error("Failed to write trace %s: %s", trace.trace_id, e)
+
+def instrument_engine(engine):
+    """Record a span for every statement executed on a SQLAlchemy engine"""
+    @event.listens_for(engine, 'before_cursor_execute')
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        current = span('db.query', **{'db.statement': statement[:200]})
+        current.__enter__()
+        conn.info.setdefault('trace_spans', []).append(current)
+
+    @event.listens_for(engine, 'after_cursor_execute')
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        spans = conn.info.get('trace_spans')
+        if spans:
+            spans.pop().__exit__(None, None, None)
+
+    @event.listens_for(engine, 'handle_error')
+    def handle_error(context):
+        spans = context.connection.info.get('trace_spans') if context.connection else None
+        if spans:
+            error = context.original_exception
+            spans.pop().__exit__(type(error), error, None)
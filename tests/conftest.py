@@ -0,0 +1,36 @@
+import json
+import pytest
+from main import TemplateRegistry
+
+@pytest.fixture
+def registry(tmp_path):
+    """Registry over a small manifest: a core tier and a tier whose feature replaces bot.py"""
+    root = tmp_path / 'templates'
+    (root / 'files').mkdir(parents=True)
+    (root / 'files' / 'bot.py.tmpl').write_text("# $project_name on $$PORT\nTOKEN = '$token'\n")
+    (root / 'files' / 'fast_bot.py.tmpl').write_text("# fast $project_name\nTOKEN = '$token'\n")
+    (root / 'manifest.json').write_text(json.dumps({
+        'variables': {'token': 'default'},
+        'tiers': {'small': ['core'], 'fast': ['core', 'speed']},
+        'features': {
+            'core': {
+                'directories': ['handlers'],
+                'files': {'bot.py': 'bot.py', 'handlers/__init__.py': None},
+                'requirements': ['aiogram==3.13.0']
+            },
+            'speed': {
+                'variables': {'token': 'fast'},
+                'files': {'bot.py': 'fast_bot.py'},
+                'requirements': ['aiogram==3.13.0', 'uvloop==0.19.0']
+            }
+        }
+    }))
+    return TemplateRegistry(str(root))
+
+@pytest.fixture
+def project(tmp_path):
+    """Generated project directory holding only its requirements.txt"""
+    path = tmp_path / 'demo'
+    path.mkdir()
+    (path / 'requirements.txt').write_text("aiogram==3.13.0\npython-dotenv==1.0.0\n")
+    return str(path)
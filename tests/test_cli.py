@@ -0,0 +1,58 @@
+import json
+import sys
+import pytest
+import main
+from main import ProjectSpec, load_manifest, run_installer, validate_specs
+
+def test_manifest_defaults_apply_to_every_project(tmp_path):
+    path = tmp_path / 'bots.json'
+    path.write_text(json.dumps({
+        'defaults': {'size': 'middle', 'install': False},
+        'projects': ['alpha', {'name': 'beta', 'size': 'pro', 'features': ['tests']}]
+    }))
+
+    assert load_manifest(str(path)) == [
+        ProjectSpec('alpha', 'middle', False),
+        ProjectSpec('beta', 'pro', False, ('tests',))
+    ]
+
+    path.write_text(json.dumps(['alpha', {'size': 'pro'}]))
+    with pytest.raises(ValueError, match="without a name"):
+        load_manifest(str(path))
+
+def test_specs_are_validated_before_anything_is_written():
+    with pytest.raises(ValueError, match="Invalid size"):
+        validate_specs([ProjectSpec('alpha', 'huge')])
+    with pytest.raises(ValueError, match="listed twice"):
+        validate_specs([ProjectSpec('alpha'), ProjectSpec('alpha', 'middle')])
+
+def test_batch_run_generates_every_project_without_prompting(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr('builtins.input', lambda prompt: pytest.fail("prompted in batch mode"))
+    (tmp_path / 'bots.json').write_text(json.dumps([{'name': 'beta', 'size': 'middle'}]))
+
+    main.main(['alpha', '--manifest', 'bots.json', '--no-install', '--no-progress', '--jobs', '2'])
+
+    assert (tmp_path / 'alpha' / 'bot.py').is_file()
+    assert (tmp_path / 'beta' / 'database.py').is_file()
+    assert not (tmp_path / 'alpha' / 'database.py').exists()
+    assert "beta generated successfully" in capsys.readouterr().out
+
+def test_batch_run_without_projects_is_an_error(monkeypatch):
+    monkeypatch.setattr(sys.stdin, 'isatty', lambda: False)
+    with pytest.raises(SystemExit):
+        main.main(['--no-install'])
+
+def test_installer_progress_counts_reported_packages():
+    output = (
+        "Collecting aiogram==3.13.0\n"
+        "Requirement already satisfied: python-dotenv==1.0.0 in /venv\n"
+        "Collecting aiohttp (from aiogram==3.13.0)\n"
+    )
+    command = [sys.executable, '-c', f"print({output!r}, end='')"]
+    done = []
+
+    run_installer(command, {'aiogram', 'python-dotenv', 'tqdm'}, done.append)
+
+    # tqdm was never reported, it still counts once the installer succeeds
+    assert done == ['aiogram', 'python-dotenv', 'tqdm']
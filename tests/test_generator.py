@@ -0,0 +1,10 @@
+import os
+from main import TemplateRegistry
+
+def test_every_tier_ships_tests_with_the_testkit():
+    registry = TemplateRegistry()
+    for size in registry.tiers:
+        _, files = registry.plan('bot', size)
+        paths = {os.path.relpath(path, 'bot') for path, _ in files}
+        assert {'testkit.py', 'pytest.ini', os.path.join('tests', 'conftest.py')} <= paths, size
+        assert any(path.startswith(os.path.join('tests', 'test_')) for path in paths), size
@@ -0,0 +1,71 @@
+import json
+import os
+import stat
+from pathlib import Path
+import main
+from main import (
+    ADDED, KEPT, OBSOLETE, UNCHANGED, UPDATED, InstallOptions,
+    install_projects, needs_install, record_install, write_file, write_project
+)
+
+def test_regeneration_keeps_local_edits(registry, tmp_path):
+    project = str(tmp_path / 'demo')
+    bot_file = Path(project, 'bot.py')
+    plan = registry.plan(project, 'small')
+    assert {change.status for change in write_project(project, *plan)} == {ADDED}
+    assert {change.status for change in write_project(project, *plan)} == {UNCHANGED}
+
+    directories, files = registry.plan(project, 'small', variables={'token': 'new'})
+    changes = {change.path: change.status for change in write_project(project, directories, files)}
+    assert changes['bot.py'] == UPDATED
+
+    with bot_file.open('a') as file:
+        file.write("# local edit\n")
+    directories, files = registry.plan(project, 'small', variables={'token': 'newer'})
+    changes = write_project(project, directories, files, with_diff=True)
+    assert changes[0].status == KEPT and "+TOKEN = 'newer'" in changes[0].diff
+    assert "# local edit" in bot_file.read_text()
+
+    write_project(project, directories, files, force=True)
+    assert bot_file.read_text() == "# demo on $PORT\nTOKEN = 'newer'\n"
+
+    changes = write_project(project, directories, files[:1])
+    assert changes[-1] == (os.path.join('handlers', '__init__.py'), OBSOLETE, '')
+    assert os.path.exists(os.path.join(project, 'handlers', '__init__.py'))
+
+def test_rewrite_keeps_file_mode(tmp_path):
+    path = tmp_path / 'run.sh'
+    write_file(str(path), "echo one\n")
+    path.chmod(0o750)
+
+    write_file(str(path), "echo two\n")
+
+    assert path.read_text() == "echo two\n"
+    assert stat.S_IMODE(path.stat().st_mode) == 0o750
+    assert [entry.name for entry in tmp_path.iterdir()] == ['run.sh']
+
+def test_install_skipped_until_requirements_change(project, monkeypatch):
+    options = InstallOptions(venv=False, offline=True)
+    installed = []
+    monkeypatch.setattr(main, 'install_requirements', lambda name, progress, options: installed.append(name))
+
+    assert needs_install(project, options)
+    assert install_projects([project], options, show_progress=False) == [project]
+    assert not needs_install(project, options)
+    assert install_projects([project], options, show_progress=False) == []
+    assert needs_install(project, InstallOptions(venv=True, offline=True))
+
+    with open(os.path.join(project, 'requirements.txt'), 'a') as file:
+        file.write("tqdm==4.66.1\n")
+    assert needs_install(project, options)
+    assert installed == [project]
+
+def test_record_install_keeps_file_hashes(project):
+    state_file = Path(project, main.STATE_FILE)
+    state_file.write_text(json.dumps({'files': {'bot.py': 'abc'}}))
+
+    record_install(project, "aiogram==3.13.0\n", InstallOptions(venv=False))
+
+    state = json.loads(state_file.read_text())
+    assert state['files'] == {'bot.py': 'abc'}
+    assert state['installed']['target'] == main.sys.executable
@@ -0,0 +1,68 @@
+import os
+import sys
+import main
+from main import InstallOptions, create_venv, defer_install, install_projects, install_requirements, venv_python
+
+def _copy(project, tmp_path, name):
+    other = tmp_path / name
+    other.mkdir()
+    (other / 'requirements.txt').write_text((tmp_path / 'demo' / 'requirements.txt').read_text())
+    return str(other)
+
+def test_identical_requirements_build_wheels_once(project, tmp_path, monkeypatch):
+    other = _copy(project, tmp_path, 'other')
+    installed, wheels = [], []
+    monkeypatch.setattr(main, 'install_requirements', lambda name, progress, options: installed.append(name))
+    monkeypatch.setattr(main, 'build_wheelhouse', lambda requirements, options, progress: wheels.append(requirements))
+
+    assert install_projects([project, other], InstallOptions(), show_progress=False) == [project, other]
+    assert sorted(installed) == [project, other]
+    assert wheels == [os.path.join(project, 'requirements.txt')]
+
+def test_projects_sharing_requirements_install_once_without_venv(project, tmp_path, monkeypatch):
+    other = _copy(project, tmp_path, 'other')
+    installed, wheels = [], []
+    monkeypatch.setattr(main, 'install_requirements', lambda name, progress, options: installed.append(name))
+    monkeypatch.setattr(main, 'build_wheelhouse', lambda *args: wheels.append(args))
+
+    options = InstallOptions(venv=False, offline=True)
+    assert install_projects([project, other], options, show_progress=False) == [project, other]
+    assert installed == [project]
+    assert wheels == []
+
+def test_installer_commands_use_the_wheelhouse(project, monkeypatch):
+    commands = []
+    monkeypatch.setattr(main, 'run_installer', lambda command, names, progress=None: commands.append((command, names)))
+    monkeypatch.setattr(main, 'create_venv', lambda name, options: None)
+
+    install_requirements(project, options=InstallOptions(wheelhouse='/wheels'))
+    command, names = commands.pop()
+    assert command[command.index('--python') + 1] == venv_python(project)
+    assert '--no-index' in command and command[command.index('--find-links') + 1] == '/wheels'
+    assert command[-1] == 'pip' and names == {'aiogram', 'python-dotenv', 'pip'}
+
+    install_requirements(project, options=InstallOptions(venv=False, wheelhouse='/wheels', offline=True, uv='uv'))
+    command, names = commands.pop()
+    assert command[:3] == ['uv', 'pip', 'install']
+    assert command[-3:] == ['--offline', '--find-links', '/wheels']
+    assert names == {'aiogram', 'python-dotenv'}
+
+def test_venv_is_created_once_without_pip(project):
+    create_venv(project)
+    python = venv_python(project)
+    assert os.path.exists(python)
+    assert not os.path.exists(os.path.join(os.path.dirname(python), 'pip'))
+
+    mtime = os.stat(python).st_mtime_ns
+    create_venv(project)
+    assert os.stat(python).st_mtime_ns == mtime
+
+def test_deferred_install_runs_detached(project, tmp_path, monkeypatch):
+    calls = []
+    monkeypatch.setattr(main.subprocess, 'Popen', lambda command, **kwargs: calls.append((command, kwargs)))
+
+    defer_install([project], ['--offline'], str(tmp_path / 'install.log'))
+
+    command, kwargs = calls[0]
+    assert command[0] == sys.executable and command[2:] == ['--install-only', '--no-progress', '--offline', project]
+    assert kwargs['start_new_session'] and kwargs['stdin'] is main.subprocess.DEVNULL
@@ -0,0 +1,43 @@
+import os
+import main
+from main import TemplateRegistry
+
+def planned_files(files, project_name):
+    return {os.path.relpath(path, project_name): text for path, text in files}
+
+def test_later_feature_replaces_files_and_variable_defaults(registry):
+    directories, files = registry.plan('demo', 'fast')
+    planned = planned_files(files, 'demo')
+
+    assert directories == ['demo', os.path.join('demo', 'handlers')]
+    assert planned == {'bot.py': "# fast demo\nTOKEN = 'fast'\n", os.path.join('handlers', '__init__.py'): ''}
+
+    _, files = registry.plan('demo', 'fast', variables={'token': 'secret'})
+    assert planned_files(files, 'demo')['bot.py'] == "# fast demo\nTOKEN = 'secret'\n"
+
+def test_performance_tier_plans_the_async_stack():
+    _, files = TemplateRegistry().plan('bot', 'performance')
+    planned = planned_files(files, 'bot')
+
+    assert {
+        'storage.py',
+        os.path.join('utils', 'http.py'),
+        os.path.join('middlewares', 'metrics.py'),
+        os.path.join('tests', 'test_smoke.py')
+    } <= set(planned)
+    assert 'create_async_engine' in planned['database.py']
+    assert "os.getenv('DATABASE_URL', 'sqlite+aiosqlite:///bot.db')" in planned['config.py']
+
+    requirements = planned['requirements.txt'].split()
+    assert 'aiosqlite==0.19.0' in requirements
+    assert len(requirements) == len(set(requirements))
+    assert sum(requirement.startswith('aiogram==') for requirement in requirements) == 1
+
+def test_database_url_can_be_set_from_the_command_line(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    main.main(['bot', '--size', 'performance', '--var', 'database_url=postgresql+asyncpg://db/bot',
+               '--no-install', '--no-progress'])
+
+    config = (tmp_path / 'bot' / 'config.py').read_text()
+    assert "os.getenv('DATABASE_URL', 'postgresql+asyncpg://db/bot')" in config
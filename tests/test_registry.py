@@ -0,0 +1,37 @@
+import os
+import py_compile
+import pytest
+from main import TemplateRegistry
+
+def test_plan_renders_tier_features_in_order(registry, tmp_path):
+    project = str(tmp_path / 'demo')
+    directories, files = registry.plan(project, 'small', variables={'token': 'abc'})
+
+    assert directories == [project, os.path.join(project, 'handlers')]
+    assert dict(files) == {
+        os.path.join(project, 'bot.py'): "# demo on $PORT\nTOKEN = 'abc'\n",
+        os.path.join(project, 'handlers', '__init__.py'): ''
+    }
+    assert registry.feature_names('small', ['speed', 'core']) == ['core', 'speed']
+
+def test_plan_rejects_unknown_size_and_feature(registry):
+    with pytest.raises(ValueError, match="Invalid size"):
+        registry.feature_names('huge')
+    with pytest.raises(ValueError, match="Unknown feature"):
+        registry.feature_names('small', ['webhooks'])
+
+def test_templates_render_once_per_distinct_values(registry):
+    text = registry.render('bot.py', {'project_name': 'demo', 'token': 'abc'})
+    assert registry.render('bot.py', {'project_name': 'demo', 'token': 'abc', 'unused': 1}) is text
+    with pytest.raises(ValueError, match="needs token"):
+        registry.render('bot.py', {'project_name': 'demo'})
+
+@pytest.mark.parametrize('size', TemplateRegistry().tiers)
+def test_shipped_templates_render_valid_python(size, tmp_path):
+    directories, files = TemplateRegistry().plan(str(tmp_path / 'bot'), size)
+    for path, content in files:
+        if path.endswith('.py'):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'w', encoding='utf-8') as file:
+                file.write(content)
+            py_compile.compile(path, doraise=True)